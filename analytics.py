@@ -0,0 +1,104 @@
+import json
+import numpy as np
+from logic import BITBOARDS, argument, decode
+from pathlib import Path
+from records import (
+    RECORD_PLAYERS,
+    RECORDS_PATH,
+    iterate_records,
+    unpack_moves,
+)
+
+
+OUTCOME_NAMES = ("Tie", "P1", "P2")
+PLIES = np.arange(9)
+
+
+def count_openings(moves: np.ndarray, winners: np.ndarray, depth: int) -> np.ndarray:
+    keys = (moves[:, :depth].astype(np.int64) * 9 ** PLIES[:depth]).sum(axis=1)
+    played = (moves[:, :depth] >= 0).all(axis=1)
+    return np.bincount(
+        keys[played] * 3 + winners[played], minlength=9**depth * 3
+    ).reshape(-1, 3)
+
+
+def count_states(moves: np.ndarray, first: np.ndarray) -> np.ndarray:
+    played = moves >= 0
+    pieces = 1 + (PLIES + first[:, None].astype(np.int64)) % 2
+    steps = np.where(played, 3 ** moves.clip(0).astype(np.int64) * pieces, 0)
+    visits = np.bincount(steps.cumsum(axis=1)[played], minlength=3**9)
+    visits[0] += len(moves)
+    return visits
+
+
+def count_pairings(records: np.ndarray) -> np.ndarray:
+    players = len(RECORD_PLAYERS)
+    keys = records["p1"].astype(np.int64) * players + records["p2"]
+    return np.bincount(
+        keys * 3 + records["winner"], minlength=players * players * 3
+    ).reshape(players, players, 3)
+
+
+def analyze_records(
+    path: Path = RECORDS_PATH, depth: int = 2, chunk: int = 1 << 20
+) -> dict:
+    openings = np.zeros((9**depth, 3), dtype=np.int64)
+    visits = np.zeros(3**9, dtype=np.int64)
+    pairings = np.zeros((len(RECORD_PLAYERS),) * 2 + (3,), dtype=np.int64)
+    for records in iterate_records(path, chunk):
+        moves = unpack_moves(records["moves"])
+        winners = records["winner"].astype(np.int64)
+        openings += count_openings(moves, winners, depth)
+        visits += count_states(moves, records["first"])
+        pairings += count_pairings(records)
+
+    return {"openings": openings, "visits": visits, "pairings": pairings}
+
+
+def outcome_rates(counts: np.ndarray) -> dict:
+    games = int(counts.sum())
+    return {"games": games} | {
+        name: round(int(count) / games, 4) for name, count in zip(OUTCOME_NAMES, counts)
+    }
+
+
+def opening_rates(openings: np.ndarray, depth: int) -> dict:
+    return {
+        " ".join(str(key // 9**i % 9) for i in range(depth)): outcome_rates(
+            openings[key]
+        )
+        for key in np.flatnonzero(openings.sum(axis=1)).tolist()
+    }
+
+
+def state_visits(visits: np.ndarray, top: int) -> dict:
+    return {
+        decode(int(BITBOARDS[code])): int(visits[code])
+        for code in np.argsort(-visits, kind="stable")[:top].tolist()
+        if visits[code]
+    }
+
+
+def first_mover_advantage(pairings: np.ndarray) -> dict:
+    advantages = {}
+    for p1, p2 in zip(*np.nonzero(pairings.sum(axis=2))):
+        rates = outcome_rates(pairings[p1, p2])
+        rates["advantage"] = round(rates["P1"] - rates["P2"], 4)
+        advantages[f"{RECORD_PLAYERS[p1]} vs {RECORD_PLAYERS[p2]}"] = rates
+
+    return advantages
+
+
+if __name__ == "__main__":
+    depth = int(argument("--depth", "2"))
+    results = analyze_records(depth=depth)
+    print(
+        json.dumps(
+            {
+                "openings": opening_rates(results["openings"], depth),
+                "states": state_visits(results["visits"], int(argument("--top", "20"))),
+                "pairings": first_mover_advantage(results["pairings"]),
+            },
+            indent=4,
+        )
+    )
@@ -1,22 +1,45 @@
 import json
+import numpy as np
+import os
 import pickle
+import sys
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from itertools import accumulate, product
-from logic import LINES
+from logic import (
+    CLASS_CODES,
+    CLASS_TABLE,
+    GAP_TABLE,
+    GAPS_PATH,
+    LINES,
+    MOVESETS,
+    OUTCOMES_PATH,
+    STATE_FIELDS,
+    Geometry,
+    Negamax,
+    argument,
+    canonicalize,
+    check_state,
+    decode,
+    encode,
+    gap_table,
+    outcome_table,
+    states_path,
+    ternary,
+)
 from pathlib import Path
-from typing import Tuple
+from typing import Iterator, Tuple
 
 
 FOLDER = str(Path(__file__).parent).replace("\\", "/")
-
-
-def check_state(board: str) -> Tuple[bool, str]:
-    for start, stop, step in LINES:
-        line = board[start:stop:step]
-        if len(set(line)) == 1 and (winner := line[0]) in {"O", "X"}:
-            return True, winner
-
-    return " " not in board, None
+CANONICAL = "--canonical" in sys.argv
+SUFFIX = "-d4" if CANONICAL else ""
+WORKERS = int(argument("--workers", str(os.cpu_count())))
+ROWS, COLUMNS = map(int, argument("--board", "3x3").split("x"))
+K = int(argument("--k", str(min(ROWS, COLUMNS))))
+DEPTH = int(argument("--depth", str(ROWS * COLUMNS)))
+PLIES = int(argument("--plies", "1"))
+ENUMERABLE = (ROWS, COLUMNS, K) == (3, 3, 3)
 
 
 def is_valid(board: str) -> bool:
@@ -34,9 +57,6 @@ def is_valid(board: str) -> bool:
     )
 
 
-VALID_BOARDS = [board for board in product(" OX", repeat=9) if is_valid(board)]
-
-
 def repr_board(board: str, indent: int) -> str:
     return (
         " " * indent
@@ -48,117 +68,184 @@ def repr_board(board: str, indent: int) -> str:
     )
 
 
-Path(f"{FOLDER}/Data/tic-tac-toe-boards.txt").write_text(
-    "[\n" + ",\n".join(repr_board(board, 1) for board in VALID_BOARDS) + "\n]"
-)
+def best_move(moves: Counter) -> int:
+    return min(moves, key=lambda move: (-moves[move], move))
+
+
+def children(board: str, first: str) -> Iterator[Tuple[int, str]]:
+    other = "OX".replace(first, "")
+    piece = first if board.count(first) == board.count(other) else other
+    for i, s in enumerate(board):
+        if s == " ":
+            child = board[:i] + piece + board[i + 1 :]
+            yield i, decode(canonicalize(encode(child))) if CANONICAL else child
+
+
+def terminal_state(board: str, winner: str) -> dict:
+    return {
+        "over": True,
+        "repr": [board[i : i + 3] for i in (0, 3, 6)],
+        "wins": int(winner == "O"),
+        "ties": int(winner is None),
+    }
+
+
+def board_state(board: str, first: str, states: dict) -> dict:
+    total_wins = total_ties = 0
+    win_moves = Counter()
+    tie_moves = Counter()
+    high_stakes = Counter()
+    legal_moves = []
+    for i, child in children(board, first):
+        legal_moves.append(i)
+        wins, ties = states[child]["wins"], states[child]["ties"]
+        if wins:
+            win_moves[i] = wins
+            total_wins += wins
+
+        if ties:
+            tie_moves[i] = ties
+            total_ties += ties
+
+        if (wins := wins - ties) > 0:
+            high_stakes[i] = wins
+
+    state = {
+        "over": False,
+        "repr": [board[i : i + 3] for i in (0, 3, 6)],
+        "wins": total_wins,
+        "ties": total_ties,
+        "legal_moves": tuple(legal_moves),
+    }
+    if total_wins:
+        state["win_moves"] = win_moves
+
+    if total_ties:
+        state["tie_moves"] = tie_moves
+
+    if high_stakes:
+        state["high_stakes"] = high_stakes
+
+    if best_moves := {
+        moveset: best_move(state[moveset]) for moveset in MOVESETS if moveset in state
+    }:
+        state["best_moves"] = best_moves
+
+    return state
+
+
+def retrograde(root: str, first: str) -> dict:
+    layers = [{root}]
+    winners = {}
+    while layers[-1]:
+        layer = set()
+        for board in layers[-1]:
+            over, winners[board], _ = check_state(encode(board))
+            if not over:
+                layer.update(child for _, child in children(board, first))
+
+        layers.append(layer)
+
+    states = {}
+    for layer in reversed(layers):
+        for board in layer:
+            states[board] = (
+                board_state(board, first, states)
+                if board.count(" ") and winners[board] is None
+                else terminal_state(board, winners[board])
+            )
+
+    return states
+
+
+def depth_first(root: str, first: str, states: dict) -> dict:
+    ordered = {}
+    stack = [(root, children(root, first))]
+    while stack:
+        board, pending = stack[-1]
+        for _, child in pending:
+            if child in ordered:
+                continue
+
+            if states[child]["over"]:
+                ordered[child] = states[child]
+            else:
+                stack.append((child, children(child, first)))
+                break
+
+        else:
+            stack.pop()
+            ordered[board] = states[board]
+
+    return ordered
+
+
+def intern_keys(state: dict) -> dict:
+    if "best_moves" in state:
+        state["best_moves"] = {
+            sys.intern(moveset): move for moveset, move in state["best_moves"].items()
+        }
 
-Path(f"{FOLDER}/Data/tic-tac-toe-boards.json").write_text(
-    "[\n" + ",\n".join('\t"' + "".join(board) + '"' for board in VALID_BOARDS) + "\n]"
-)
+    return {sys.intern(key): value for key, value in state.items()}
 
 
-STATES_P1 = {}
-STATES_P2 = {}
-
-
-class Board_Analyzer:
-    def __init__(self, board: str, move: str, states: dict) -> None:
-        self.other = "OX".replace(move, "")
-        self.total_wins = 0
-        self.total_ties = 0
-        self.win_moves = Counter()
-        self.tie_moves = Counter()
-        self.high_stakes = Counter()
-        self.legal_moves = []
-        self.board = board
-        self.states = states
-        self.move = move
-
-    def set_board_state(self) -> None:
-        state = {
-            "over": False,
-            "repr": [self.board[i : i + 3] for i in (0, 3, 6)],
-            "wins": self.total_wins,
-            "ties": self.total_ties,
-            "legal_moves": tuple(self.legal_moves),
-        }
-        if self.total_wins:
-            state["win_moves"] = self.win_moves
-
-        if self.total_ties:
-            state["tie_moves"] = self.tie_moves
-
-        if self.high_stakes:
-            state["high_stakes"] = self.high_stakes
-
-        self.states[self.board] = state
-
-    def analyze(self) -> Tuple[int, int]:
-        for i, s in enumerate(self.board):
-            if s == " ":
-                self.legal_moves.append(i)
-                wins, ties = build_state_tree(
-                    self.board[:i] + self.move + self.board[i + 1 :],
-                    self.other,
-                    self.states,
-                )
-                if wins:
-                    self.win_moves[i] = wins
-                    self.total_wins += wins
-
-                if ties:
-                    self.tie_moves[i] = ties
-                    self.total_ties += ties
-
-                if (wins := wins - ties) > 0:
-                    self.high_stakes[i] = wins
-
-        self.set_board_state()
-        return self.total_wins, self.total_ties
-
-
-def build_state_tree(board: str, move: str, states: dict) -> Tuple[int, int]:
-    if board in states:
-        return states[board]["wins"], states[board]["ties"]
-
-    over, winner = check_state(board)
-    if over:
-        states[board] = {
-            "over": True,
-            "repr": [board[i : i + 3] for i in (0, 3, 6)],
-            "wins": (wins := int(winner == "O")),
-            "ties": (ties := int(winner is None)),
-        }
-        return wins, ties
+def build_states(first: str, executor: ProcessPoolExecutor = None) -> dict:
+    root = " " * 9
+    if executor is None:
+        states = retrograde(root, first)
+    else:
+        roots = sorted({child for _, child in children(root, first)})
+        states = {}
+        for subtree in executor.map(retrograde, roots, [first] * len(roots)):
+            states.update(
+                (board, intern_keys(state)) for board, state in subtree.items()
+            )
 
-    return Board_Analyzer(board, move, states).analyze()
+        states[root] = board_state(root, first, states)
 
+    return dict(
+        sorted(
+            depth_first(root, first, states).items(),
+            key=lambda x: (x[1]["over"], -x[1]["wins"] - x[1]["ties"]),
+        )
+    )
 
-build_state_tree(" " * 9, "O", STATES_P1)
-build_state_tree(" " * 9, "X", STATES_P2)
 
-STATES_P1 = dict(
-    sorted(
-        STATES_P1.items(), key=lambda x: (x[1]["over"], -x[1]["wins"] - x[1]["ties"])
-    )
-)
-STATES_P2 = dict(
-    sorted(
-        STATES_P2.items(), key=lambda x: (x[1]["over"], -x[1]["wins"] - x[1]["ties"])
+def dump_states(states: dict, name: str) -> None:
+    Path(f"{FOLDER}/Data/tic-tac-toe-states-{name}{SUFFIX}.pkl").write_bytes(
+        pickle.dumps(
+            {encode(board): state for board, state in states.items()},
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
     )
-)
-Path(f"{FOLDER}/Data/tic-tac-toe-states-p1.json").write_text(
-    json.dumps(STATES_P1, indent=4)
-)
-Path(f"{FOLDER}/Data/tic-tac-toe-states-p2.json").write_text(
-    json.dumps(STATES_P2, indent=4)
-)
-Path(f"{FOLDER}/Data/tic-tac-toe-states-p1-counter.pkl").write_bytes(
-    pickle.dumps(STATES_P1, protocol=pickle.HIGHEST_PROTOCOL)
-)
-Path(f"{FOLDER}/Data/tic-tac-toe-states-p2-counter.pkl").write_bytes(
-    pickle.dumps(STATES_P2, protocol=pickle.HIGHEST_PROTOCOL)
-)
+
+
+def flatten_states(states: dict, side: str) -> None:
+    codes = CLASS_CODES if CANONICAL else np.arange(3**9)
+    table = np.zeros(len(codes), dtype=STATE_FIELDS)
+    table["best"] = -1
+    for board, state in states.items():
+        code = ternary(encode(board))
+        if CANONICAL:
+            code = CLASS_TABLE[code]
+
+        table["wins"][code] = state["wins"]
+        table["ties"][code] = state["ties"]
+        for index, moveset in enumerate(MOVESETS):
+            for move, weight in state.get(moveset, {}).items():
+                table["weights"][code, index, move] = weight
+
+            if (move := state.get("best_moves", {}).get(moveset)) is not None:
+                table["best"][code, index] = move
+
+    table["cumulative"] = table["weights"].cumsum(axis=2)
+    for low_stakes in (0, 1):
+        best = table["best"][:, low_stakes:]
+        first = best[np.arange(len(codes)), (best >= 0).argmax(axis=1)]
+        gaps = GAP_TABLE[codes]
+        table["decision"][:, low_stakes] = np.where(gaps >= 0, gaps, first)
+
+    np.save(states_path(side, CANONICAL), table)
 
 
 def convert_weights(dic: dict, key: str) -> None:
@@ -167,23 +254,92 @@ def convert_weights(dic: dict, key: str) -> None:
         dic[key] = (moves, tuple(accumulate(weights)))
 
 
-for v in STATES_P1.values():
-    v.pop("repr")
-    convert_weights(v, "win_moves")
-    convert_weights(v, "tie_moves")
-    convert_weights(v, "high_stakes")
-
-Path(f"{FOLDER}/Data/tic-tac-toe-states-p1.pkl").write_bytes(
-    pickle.dumps(STATES_P1, protocol=pickle.HIGHEST_PROTOCOL)
-)
+def save_states(states: dict, side: str) -> None:
+    Path(f"{FOLDER}/Data/tic-tac-toe-states-{side}{SUFFIX}.json").write_text(
+        json.dumps(states, indent=4)
+    )
+    dump_states(states, f"{side}-counter")
+    flatten_states(states, side)
+    for v in states.values():
+        v.pop("repr")
+        convert_weights(v, "win_moves")
+        convert_weights(v, "tie_moves")
+        convert_weights(v, "high_stakes")
+
+    dump_states(states, side)
+
+
+def search_states(geometry: Geometry) -> None:
+    solver = Negamax(geometry, DEPTH)
+    states = {}
+    layer = {0}
+    for _ in range(PLIES + 1):
+        frontier = set()
+        for board in sorted(layer):
+            if geometry.check_state(board)[0]:
+                continue
+
+            score, move = solver.solve(board)
+            states[geometry.decode(board)] = {
+                "score": score,
+                "best_move": move,
+                "legal_moves": geometry.legal_moves(board),
+            }
+            frontier.update(
+                geometry.swap(board | 1 << cell) for cell in geometry.legal_moves(board)
+            )
+
+        layer = frontier
+
+    Path(
+        f"{FOLDER}/Data/tic-tac-toe-{ROWS}x{COLUMNS}-k{K}-depth{DEPTH}.json"
+    ).write_text(json.dumps(states, indent=4))
+
+
+def main() -> None:
+    if not ENUMERABLE:
+        search_states(Geometry(ROWS, COLUMNS, K))
+        return
+
+    np.save(OUTCOMES_PATH, outcome_table())
+    np.save(GAPS_PATH, gap_table())
+    valid_boards = [board for board in product(" OX", repeat=9) if is_valid(board)]
+    Path(f"{FOLDER}/Data/tic-tac-toe-boards.txt").write_text(
+        "[\n" + ",\n".join(repr_board(board, 1) for board in valid_boards) + "\n]"
+    )
+    Path(f"{FOLDER}/Data/tic-tac-toe-boards.json").write_text(
+        "[\n"
+        + ",\n".join('\t"' + "".join(board) + '"' for board in valid_boards)
+        + "\n]"
+    )
+    if WORKERS > 1:
+        with ProcessPoolExecutor(WORKERS) as executor:
+            states_p1 = build_states("O", executor)
+            states_p2 = build_states("X", executor)
+    else:
+        states_p1 = build_states("O")
+        states_p2 = build_states("X")
+
+    save_states(states_p1, "p1")
+    save_states(states_p2, "p2")
+    if not CANONICAL:
+        for name in ("p1", "p2", "p1-counter", "p2-counter"):
+            Path(f"{FOLDER}/Data/tic-tac-toe-states-{name}-d4.pkl").unlink(
+                missing_ok=True
+            )
+
+        for side in ("p1", "p2"):
+            states_path(side, True).unlink(missing_ok=True)
+
+    assert not (
+        {
+            decode(canonicalize(encode(board))) if CANONICAL else "".join(board)
+            for board in valid_boards
+        }
+        - set(states_p1)
+        - set(states_p2)
+    )
 
-for v in STATES_P2.values():
-    v.pop("repr")
-    convert_weights(v, "win_moves")
-    convert_weights(v, "tie_moves")
-    convert_weights(v, "high_stakes")
 
-Path(f"{FOLDER}/Data/tic-tac-toe-states-p2.pkl").write_bytes(
-    pickle.dumps(STATES_P2, protocol=pickle.HIGHEST_PROTOCOL)
-)
-assert not {"".join(e) for e in VALID_BOARDS} - set(STATES_P1) - set(STATES_P2)
+if __name__ == "__main__":
+    main()
@@ -305,9 +305,7 @@ class Animation(QThread):
     def nought(self) -> None:
         GLOBALS["active"] = GLOBALS["PO"]["name"]
         self.playermove.emit()
-        move = optimal_move(
-            GLOBALS["AnimationBoard"].state_string, GLOBALS["PO"]["states"], 0
-        )
+        move = optimal_move(GLOBALS["AnimationBoard"].state, GLOBALS["PO"]["states"], 0)
         self.make_move(move, "O")
 
     def cross(self) -> None:
@@ -339,7 +337,7 @@ class Animation(QThread):
             self.judge()
 
     def judge(self) -> None:
-        state, winner, line = check_state(GLOBALS["AnimationBoard"].state_string)
+        state, winner, line = check_state(GLOBALS["AnimationBoard"].state)
         if winner:
             self.process_win(winner, line)
         elif state:
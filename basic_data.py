@@ -1,5 +1,6 @@
 import blend_modes
 import json
+from color import RGB_to_Lab_D50, RGB_to_Lab_D65
 from itertools import cycle
 from logic import STATES_P1, STATES_P2_COUNTER
 from pathlib import Path
@@ -158,6 +159,97 @@ BLEND_MODES = {
     "LCh D50": blend_modes.blend_color_LCh_D50,
 }
 
+BATCH_BLEND_MODES = {
+    "Lighten": (blend_modes.batch_channels, blend_modes.lighten),
+    "Screen": (blend_modes.batch_channels, blend_modes.screen),
+    "Color dodge": (blend_modes.batch_channels, blend_modes.color_dodge),
+    "Linear dodge": (blend_modes.batch_channels, blend_modes.linear_dodge),
+    "Darken": (blend_modes.batch_channels, blend_modes.darken),
+    "Multiply": (blend_modes.batch_channels, blend_modes.multiply),
+    "Color burn": (blend_modes.batch_channels, blend_modes.color_burn),
+    "Linear burn": (blend_modes.batch_channels, blend_modes.linear_burn),
+    "Overlay": (blend_modes.batch_channels, blend_modes.overlay),
+    "Soft light": (blend_modes.batch_channels, blend_modes.soft_light),
+    "Hard light": (blend_modes.batch_channels, blend_modes.hard_light),
+    "Vivid light": (blend_modes.batch_channels, blend_modes.vivid_light),
+    "Linear light": (blend_modes.batch_channels, blend_modes.linear_light),
+    "Pin light": (blend_modes.batch_channels, blend_modes.pin_light),
+    "Reflect": (blend_modes.batch_channels, blend_modes.reflect),
+    "Difference": (blend_modes.batch_channels, blend_modes.difference),
+    "Exclusion": (blend_modes.batch_channels, blend_modes.exclusion),
+    "Subtract": (blend_modes.batch_channels, blend_modes.subtract),
+    "Grain extract": (blend_modes.batch_channels, blend_modes.grain_extract),
+    "Grain merge": (blend_modes.batch_channels, blend_modes.grain_merge),
+    "Divide": (blend_modes.batch_channels, blend_modes.divide),
+    "HSV color": (
+        blend_modes.batch_pixels,
+        blend_modes.HSV_pixel,
+        blend_modes.HSV_color,
+    ),
+    "HSL color": (
+        blend_modes.batch_pixels,
+        blend_modes.HSL_pixel,
+        blend_modes.HSL_color,
+    ),
+    "Color lux": (
+        blend_modes.batch_pixels,
+        blend_modes.HSV_pixel,
+        blend_modes.color_lux,
+    ),
+    "Color nox": (
+        blend_modes.batch_pixels,
+        blend_modes.HSL_pixel,
+        blend_modes.color_nox,
+    ),
+    "LCh D65": (
+        blend_modes.batch_pixels,
+        blend_modes.RGB_to_LCh_D65,
+        blend_modes.LCh_D65_color,
+    ),
+    "LCh D50": (
+        blend_modes.batch_pixels,
+        blend_modes.RGB_to_LCh_D50,
+        blend_modes.LCh_D50_color,
+    ),
+}
+
+LUT_BLEND_MODES = BATCH_BLEND_MODES | {
+    "LCh D65": (
+        blend_modes.batch_pixels,
+        RGB_to_Lab_D65,
+        blend_modes.LCh_D65_color_LUT,
+    ),
+    "LCh D50": (
+        blend_modes.batch_pixels,
+        RGB_to_Lab_D50,
+        blend_modes.LCh_D50_color_LUT,
+    ),
+}
+
+FIXED_BLEND_MODES = {
+    "Lighten": (blend_modes.batch_fixed, blend_modes.fixed_lighten),
+    "Screen": (blend_modes.batch_fixed, blend_modes.fixed_screen),
+    "Color dodge": (blend_modes.batch_fixed, blend_modes.fixed_color_dodge),
+    "Linear dodge": (blend_modes.batch_fixed, blend_modes.fixed_linear_dodge),
+    "Darken": (blend_modes.batch_fixed, blend_modes.fixed_darken),
+    "Multiply": (blend_modes.batch_fixed, blend_modes.fixed_multiply),
+    "Color burn": (blend_modes.batch_fixed, blend_modes.fixed_color_burn),
+    "Linear burn": (blend_modes.batch_fixed, blend_modes.fixed_linear_burn),
+    "Overlay": (blend_modes.batch_fixed, blend_modes.fixed_overlay),
+    "Soft light": (blend_modes.batch_fixed, blend_modes.fixed_soft_light),
+    "Hard light": (blend_modes.batch_fixed, blend_modes.fixed_hard_light),
+    "Vivid light": (blend_modes.batch_fixed, blend_modes.fixed_vivid_light),
+    "Linear light": (blend_modes.batch_fixed, blend_modes.fixed_linear_light),
+    "Pin light": (blend_modes.batch_fixed, blend_modes.fixed_pin_light),
+    "Reflect": (blend_modes.batch_fixed, blend_modes.fixed_reflect),
+    "Difference": (blend_modes.batch_fixed, blend_modes.fixed_difference),
+    "Exclusion": (blend_modes.batch_fixed, blend_modes.fixed_exclusion),
+    "Subtract": (blend_modes.batch_fixed, blend_modes.fixed_subtract),
+    "Grain extract": (blend_modes.batch_fixed, blend_modes.fixed_grain_extract),
+    "Grain merge": (blend_modes.batch_fixed, blend_modes.fixed_grain_merge),
+    "Divide": (blend_modes.batch_fixed, blend_modes.fixed_divide),
+}
+
 
 IMMUTABLE = """DummyButton#Base, DummyButton#Hover, QPushButton, QPushButton#P1, QPushButton#P2, SquareButton {{
     border-style: outset;
@@ -0,0 +1,81 @@
+import numpy as np
+import sys
+from theme import BLEND_MODES, render_batch
+from typing import List, Tuple
+
+KNOWN_DIFFERENCES = {"Grain extract", "Grain merge"}
+BACKENDS = {
+    "float64": ("float64", False),
+    "float32": ("float32", False),
+    "fixed": ("fixed", False),
+    "LUT": ("float64", True),
+    "fixed LUT": ("fixed", True),
+}
+
+
+def sample_batches(seed: int = 0) -> List[Tuple[np.ndarray, np.ndarray]]:
+    levels = np.arange(256)
+    ramp = np.zeros((256, 256, 1, 4), dtype=np.uint8)
+    ramp[..., 0, 0] = levels
+    ramp[..., 0, 1] = 255 - levels
+    ramp[..., 0, 2] = levels * 7 % 256
+    ramp[..., 0, 3] = 255
+    tops = np.stack([levels, 255 - levels, levels * 13 % 256], axis=1)
+    rng = np.random.default_rng(seed)
+    return [
+        (ramp, tops.astype(np.uint8)),
+        (
+            rng.integers(0, 256, (64, 32, 32, 4), dtype=np.uint8),
+            rng.integers(0, 256, (64, 3), dtype=np.uint8),
+        ),
+    ]
+
+
+def render_baseline(images: np.ndarray, tops: np.ndarray, blend: str) -> np.ndarray:
+    out = images.copy()
+    for image, color in zip(out, tops):
+        base = image[..., 0:3] / 255
+        top = np.empty_like(base)
+        top[...] = color / 255
+        image[..., 0:3] = (BLEND_MODES[blend](base, top) * 255).round().astype(np.uint8)
+
+    return out
+
+
+def max_error(
+    blend: str,
+    backend: str,
+    lut: bool,
+    batches: List[Tuple[np.ndarray]],
+    references: List[np.ndarray],
+) -> int:
+    error = 0
+    for (images, tops), reference in zip(batches, references):
+        result = render_batch(images, tops, blend, backend, None, lut)
+        result = result.astype(np.int64)
+        error = max(error, int(np.abs(result - reference).max()))
+
+    return error
+
+
+def check_backends(tolerance: int = 1) -> bool:
+    batches = sample_batches()
+    passed = True
+    for blend in BLEND_MODES:
+        references = [
+            render_baseline(images, tops, blend).astype(np.int64)
+            for images, tops in batches
+        ]
+        errors = {
+            name: max_error(blend, *backend, batches, references)
+            for name, backend in BACKENDS.items()
+        }
+        print(f"{blend:<14}" + "".join(f"{k}: {v}  " for k, v in errors.items()))
+        passed &= max(errors.values()) <= tolerance
+        passed &= not errors["float64"] or blend in KNOWN_DIFFERENCES
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(not check_backends())
@@ -1,6 +1,18 @@
 import numba as nb
 import numpy as np
 from color import (
+    HSL_pixel,
+    HSL_short,
+    HSV_pixel,
+    HSV_short,
+    Lab_D50_to_RGB_LUT,
+    Lab_D65_to_RGB_LUT,
+    LCh_D50_to_RGB,
+    LCh_D65_to_RGB,
+    RGB_to_LCh_D50,
+    RGB_to_LCh_D65,
+    lightness_D50_LUT,
+    lightness_D65_LUT,
     RGB_to_HSL,
     RGB_to_HSV,
     HSL_to_RGB,
@@ -10,6 +22,7 @@ from color import (
     IMG_to_LCh_D50,
     LCh_D50_to_IMG,
 )
+from typing import Callable, Tuple
 
 
 @nb.njit(cache=True, fastmath=True, parallel=True)
@@ -97,7 +110,7 @@ def blend_hard_light(base: np.ndarray, top: np.ndarray) -> np.ndarray:
 
 
 @nb.njit(cache=True, fastmath=True)
-def vivid_light(b: float, t: float) -> float:
+def vivid(b: float, t: float) -> float:
     if t < 0.5:
         return max(0, 1 - (1 - b) / (2 * t)) if t else 0
     else:
@@ -111,7 +124,7 @@ def blend_vivid_light(base: np.ndarray, top: np.ndarray) -> np.ndarray:
     for y in nb.prange(height):
         for x in nb.prange(width):
             for i in (0, 1, 2):
-                result[y, x, i] = vivid_light(base[y, x, i], top[y, x, i])
+                result[y, x, i] = vivid(base[y, x, i], top[y, x, i])
 
     return result
 
@@ -228,3 +241,356 @@ def blend_color_LCh_D50(base: np.ndarray, top: np.ndarray) -> np.ndarray:
     lch = IMG_to_LCh_D50(base)
     lch[..., 1:3] = IMG_to_LCh_D50(top)[..., 1:3]
     return LCh_D50_to_IMG(lch)
+
+
+@nb.njit(cache=True, fastmath=True)
+def lighten(b: float, t: float) -> float:
+    return max(b, t)
+
+
+@nb.njit(cache=True, fastmath=True)
+def screen(b: float, t: float) -> float:
+    return b + t - b * t
+
+
+@nb.njit(cache=True)
+def color_dodge(b: float, t: float) -> float:
+    return min(1, b / (1 - t)) if t != 1 else 1
+
+
+@nb.njit(cache=True, fastmath=True)
+def linear_dodge(b: float, t: float) -> float:
+    return min(1, b + t)
+
+
+@nb.njit(cache=True, fastmath=True)
+def darken(b: float, t: float) -> float:
+    return min(b, t)
+
+
+@nb.njit(cache=True, fastmath=True)
+def multiply(b: float, t: float) -> float:
+    return b * t
+
+
+@nb.njit(cache=True)
+def color_burn(b: float, t: float) -> float:
+    return max(0, 1 - (1 - b) / t) if t != 0 else 0
+
+
+@nb.njit(cache=True, fastmath=True)
+def linear_burn(b: float, t: float) -> float:
+    return max(0, b + t - 1.0)
+
+
+@nb.njit(cache=True, fastmath=True)
+def overlay(b: float, t: float) -> float:
+    return 2 * b * t if b < 0.5 else 2 * b + 2 * t - 2 * b * t - 1
+
+
+@nb.njit(cache=True, fastmath=True)
+def soft_light(b: float, t: float) -> float:
+    return (1 - 2 * t) * b**2 + 2 * b * t
+
+
+@nb.njit(cache=True, fastmath=True)
+def hard_light(b: float, t: float) -> float:
+    return overlay(t, b)
+
+
+@nb.njit(cache=True)
+def vivid_light(b: float, t: float) -> float:
+    if t < 0.5:
+        return max(0.0, 1.0 - (1.0 - b) / (2.0 * t)) if t else 0.0
+    else:
+        return min(1.0, b / (2.0 - 2.0 * t)) if t != 1 else 1.0
+
+
+@nb.njit(cache=True, fastmath=True)
+def linear_light(b: float, t: float) -> float:
+    return min(max(b + 2 * t - 1, 0.0), 1.0)
+
+
+@nb.njit(cache=True, fastmath=True)
+def pin_light(b: float, t: float) -> float:
+    return min(b, 2 * t) if t < 0.5 else max(b, 2 * t - 1)
+
+
+@nb.njit(cache=True)
+def reflect(b: float, t: float) -> float:
+    return min(1, b**2 / (1 - t)) if t != 1 else 1
+
+
+@nb.njit(cache=True, fastmath=True)
+def difference(b: float, t: float) -> float:
+    return abs(b - t)
+
+
+@nb.njit(cache=True, fastmath=True)
+def exclusion(b: float, t: float) -> float:
+    return b + t - 2 * b * t
+
+
+@nb.njit(cache=True, fastmath=True)
+def subtract(b: float, t: float) -> float:
+    return max(0, b - t)
+
+
+@nb.njit(cache=True)
+def grain_extract(b: float, t: float) -> float:
+    return min(max(b + t - 0.5, 0), 1)
+
+
+@nb.njit(cache=True)
+def grain_merge(b: float, t: float) -> float:
+    return min(max(b - t + 0.5, 0), 1)
+
+
+@nb.njit(cache=True)
+def divide(b: float, t: float) -> float:
+    return min(1, b / t) if t != 0 else 1
+
+
+@nb.njit(cache=True)
+def HSV_color(
+    r: float, g: float, b: float, h: float, s: float, v: float
+) -> Tuple[float]:
+    return HSV_short(h, s, HSV_pixel(r, g, b)[2])
+
+
+@nb.njit(cache=True)
+def HSL_color(
+    r: float, g: float, b: float, h: float, s: float, l: float
+) -> Tuple[float]:
+    return HSL_short(h, s, HSL_pixel(r, g, b)[2])
+
+
+@nb.njit(cache=True)
+def color_lux(
+    r: float, g: float, b: float, h: float, s: float, v: float
+) -> Tuple[float]:
+    return HSL_short(h, s, HSV_pixel(r, g, b)[2])
+
+
+@nb.njit(cache=True)
+def color_nox(
+    r: float, g: float, b: float, h: float, s: float, l: float
+) -> Tuple[float]:
+    return HSV_short(h, s, HSL_pixel(r, g, b)[2])
+
+
+@nb.njit(cache=True)
+def LCh_D65_color(
+    r: float, g: float, b: float, l: float, c: float, h: float
+) -> Tuple[float]:
+    return LCh_D65_to_RGB(RGB_to_LCh_D65(r, g, b)[0], c, h)
+
+
+@nb.njit(cache=True)
+def LCh_D50_color(
+    r: float, g: float, b: float, l: float, c: float, h: float
+) -> Tuple[float]:
+    return LCh_D50_to_RGB(RGB_to_LCh_D50(r, g, b)[0], c, h)
+
+
+@nb.njit(cache=True)
+def LCh_D65_color_LUT(
+    r: float, g: float, b: float, l: float, m: float, n: float
+) -> Tuple[float]:
+    return Lab_D65_to_RGB_LUT(lightness_D65_LUT(r, g, b), m, n)
+
+
+@nb.njit(cache=True)
+def LCh_D50_color_LUT(
+    r: float, g: float, b: float, l: float, m: float, n: float
+) -> Tuple[float]:
+    return Lab_D50_to_RGB_LUT(lightness_D50_LUT(r, g, b), m, n)
+
+
+@nb.njit(cache=True)
+def convert_tops(tops: np.ndarray, prepare: Callable) -> np.ndarray:
+    out = np.empty((len(tops), 3))
+    for n in range(len(tops)):
+        p, q, s = prepare(tops[n, 0], tops[n, 1], tops[n, 2])
+        out[n, 0] = p
+        out[n, 1] = q
+        out[n, 2] = s
+
+    return out
+
+
+@nb.njit(cache=True, parallel=True)
+def batch_channels(
+    bases: np.ndarray, tops: np.ndarray, alpha: np.ndarray, channel: Callable
+) -> np.ndarray:
+    count, height, width = bases.shape[:3]
+    out = np.empty((count, height, width, 4), np.uint8)
+    for row in nb.prange(count * height):
+        n = row // height
+        y = row % height
+        for x in range(width):
+            for i in range(3):
+                out[n, y, x, i] = np.rint(channel(bases[n, y, x, i], tops[n, i]) * 255)
+
+            out[n, y, x, 3] = alpha[n, y, x]
+
+    return out
+
+
+@nb.njit(cache=True, parallel=True)
+def batch_pixels(
+    bases: np.ndarray,
+    tops: np.ndarray,
+    alpha: np.ndarray,
+    prepare: Callable,
+    pixel: Callable,
+) -> np.ndarray:
+    count, height, width = bases.shape[:3]
+    out = np.empty((count, height, width, 4), np.uint8)
+    tops = convert_tops(tops, prepare)
+    for row in nb.prange(count * height):
+        n = row // height
+        y = row % height
+        p, q, s = tops[n]
+        for x in range(width):
+            r, g, b = pixel(
+                bases[n, y, x, 0], bases[n, y, x, 1], bases[n, y, x, 2], p, q, s
+            )
+            out[n, y, x, 0] = np.rint(r * 255)
+            out[n, y, x, 1] = np.rint(g * 255)
+            out[n, y, x, 2] = np.rint(b * 255)
+            out[n, y, x, 3] = alpha[n, y, x]
+
+    return out
+
+
+@nb.njit(cache=True)
+def fixed_round(p: int, q: int) -> int:
+    return (2 * p + q) // (2 * q)
+
+
+@nb.njit(cache=True)
+def fixed_lighten(b: int, t: int) -> int:
+    return max(b, t)
+
+
+@nb.njit(cache=True)
+def fixed_screen(b: int, t: int) -> int:
+    return b + t - fixed_round(b * t, 255)
+
+
+@nb.njit(cache=True)
+def fixed_color_dodge(b: int, t: int) -> int:
+    return min(255, fixed_round(255 * b, 255 - t)) if t != 255 else 255
+
+
+@nb.njit(cache=True)
+def fixed_linear_dodge(b: int, t: int) -> int:
+    return min(255, b + t)
+
+
+@nb.njit(cache=True)
+def fixed_darken(b: int, t: int) -> int:
+    return min(b, t)
+
+
+@nb.njit(cache=True)
+def fixed_multiply(b: int, t: int) -> int:
+    return fixed_round(b * t, 255)
+
+
+@nb.njit(cache=True)
+def fixed_color_burn(b: int, t: int) -> int:
+    return max(0, 255 - fixed_round(255 * (255 - b), t)) if t else 0
+
+
+@nb.njit(cache=True)
+def fixed_linear_burn(b: int, t: int) -> int:
+    return max(0, b + t - 255)
+
+
+@nb.njit(cache=True)
+def fixed_overlay(b: int, t: int) -> int:
+    m = fixed_round(2 * b * t, 255)
+    return m if b < 128 else 2 * b + 2 * t - 255 - m
+
+
+@nb.njit(cache=True)
+def fixed_soft_light(b: int, t: int) -> int:
+    return fixed_round((255 - 2 * t) * b * b + 510 * b * t, 65025)
+
+
+@nb.njit(cache=True)
+def fixed_hard_light(b: int, t: int) -> int:
+    return fixed_overlay(t, b)
+
+
+@nb.njit(cache=True)
+def fixed_vivid_light(b: int, t: int) -> int:
+    if t < 128:
+        return max(0, 255 - fixed_round(255 * (255 - b), 2 * t)) if t else 0
+    else:
+        return min(255, fixed_round(255 * b, 510 - 2 * t)) if t != 255 else 255
+
+
+@nb.njit(cache=True)
+def fixed_linear_light(b: int, t: int) -> int:
+    return min(max(b + 2 * t - 255, 0), 255)
+
+
+@nb.njit(cache=True)
+def fixed_pin_light(b: int, t: int) -> int:
+    return min(b, 2 * t) if t < 128 else max(b, 2 * t - 255)
+
+
+@nb.njit(cache=True)
+def fixed_reflect(b: int, t: int) -> int:
+    return min(255, fixed_round(b * b, 255 - t)) if t != 255 else 255
+
+
+@nb.njit(cache=True)
+def fixed_difference(b: int, t: int) -> int:
+    return abs(b - t)
+
+
+@nb.njit(cache=True)
+def fixed_exclusion(b: int, t: int) -> int:
+    return b + t - fixed_round(2 * b * t, 255)
+
+
+@nb.njit(cache=True)
+def fixed_subtract(b: int, t: int) -> int:
+    return max(0, b - t)
+
+
+@nb.njit(cache=True)
+def fixed_grain_extract(b: int, t: int) -> int:
+    return min(max(b + t - 127, 0), 255)
+
+
+@nb.njit(cache=True)
+def fixed_grain_merge(b: int, t: int) -> int:
+    return min(max(b - t + 128, 0), 255)
+
+
+@nb.njit(cache=True)
+def fixed_divide(b: int, t: int) -> int:
+    return min(255, fixed_round(255 * b, t)) if t else 255
+
+
+@nb.njit(cache=True, parallel=True)
+def batch_fixed(images: np.ndarray, tops: np.ndarray, channel: Callable) -> np.ndarray:
+    count, height, width = images.shape[:3]
+    out = np.empty_like(images)
+    for row in nb.prange(count * height):
+        n = row // height
+        y = row % height
+        for x in range(width):
+            for i in range(3):
+                out[n, y, x, i] = channel(
+                    np.int64(images[n, y, x, i]), np.int64(tops[n, i])
+                )
+
+            out[n, y, x, 3] = images[n, y, x, 3]
+
+    return out
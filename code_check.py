@@ -8,10 +8,12 @@ from typing import Any
 
 files = [
     "advanced",
+    "analytics",
     "analyze_tic_tac_toe_states",
     "animation",
     "basics",
     "basic_data",
+    "blend_check",
     "blend_modes",
     "code_check",
     "color",
@@ -20,8 +22,11 @@ files = [
     "logic",
     "main",
     "preview",
+    "records",
     "shared",
     "theme",
+    "tournament",
+    "training",
 ]
 
 modules = {}
@@ -256,6 +256,117 @@ def LCh_D50_to_RGB(l: float, c: float, h: float) -> Tuple[float]:
     return gamma_contract(r), gamma_contract(g), gamma_contract(b)
 
 
+GAMMA_STEPS = 4096
+LAB_STEPS = 4096
+GAMMA_EXPAND_TABLE = np.array([gamma_expand(i / 255) for i in range(256)])
+GAMMA_CONTRACT_TABLE = np.array(
+    [gamma_contract(i / GAMMA_STEPS) for i in range(GAMMA_STEPS + 1)]
+)
+LABF_TABLE = np.array([LABF(i / LAB_STEPS) for i in range(LAB_STEPS + 1)])
+LABINVF_TABLE = np.array([LABINVF(i / LAB_STEPS) for i in range(LAB_STEPS + 1)])
+
+
+@nb.njit(cache=True, fastmath=True)
+def interpolate(table: np.ndarray, x: float) -> float:
+    x *= len(table) - 1
+    i = int(x)
+    return table[i] + (x - i) * (table[i + 1] - table[i])
+
+
+@nb.njit(cache=True, fastmath=True)
+def gamma_expand_LUT(c: float) -> float:
+    return GAMMA_EXPAND_TABLE[int(c * 255 + 0.5)]
+
+
+@nb.njit(cache=True, fastmath=True)
+def gamma_contract_LUT(n: float) -> float:
+    return 0.0 if n <= 0 else (1.0 if n >= 1 else interpolate(GAMMA_CONTRACT_TABLE, n))
+
+
+@nb.njit(cache=True, fastmath=True)
+def LABF_LUT(f: float) -> float:
+    return interpolate(LABF_TABLE, f) if 0 <= f < 1 else LABF(f)
+
+
+@nb.njit(cache=True, fastmath=True)
+def LABINVF_LUT(f: float) -> float:
+    return interpolate(LABINVF_TABLE, f) if 0 <= f < 1 else LABINVF(f)
+
+
+@nb.njit(cache=True, fastmath=True)
+def RGB_to_Lab_D65(r: float, g: float, b: float) -> Tuple[float]:
+    b = gamma_expand(b)
+    g = gamma_expand(g)
+    r = gamma_expand(r)
+    x = LABF((D65_Xr * r + D65_Xg * g + D65_Xb * b) / D65_Xw)
+    y = LABF(D65_Yr * r + D65_Yg * g + D65_Yb * b)
+    z = LABF((D65_Zr * r + D65_Zg * g + D65_Zb * b) / D65_Zw)
+    return 116 * y - 16, 500 * (x - y), 200 * (y - z)
+
+
+@nb.njit(cache=True, fastmath=True)
+def lightness_D65_LUT(r: float, g: float, b: float) -> float:
+    r = gamma_expand_LUT(r)
+    g = gamma_expand_LUT(g)
+    b = gamma_expand_LUT(b)
+    return 116 * LABF_LUT(D65_Yr * r + D65_Yg * g + D65_Yb * b) - 16
+
+
+@nb.njit(cache=True, fastmath=True)
+def Lab_D65_to_RGB_LUT(l: float, m: float, n: float) -> Tuple[float]:
+    l = (l + 16) / 116
+    x = D65_Xw * LABINVF_LUT(l + m / 500)
+    y = LABINVF_LUT(l)
+    z = D65_Zw * LABINVF_LUT(l - n / 200)
+    r = D65_Rx * x + D65_Ry * y + D65_Rz * z
+    g = D65_Gx * x + D65_Gy * y + D65_Gz * z
+    b = D65_Bx * x + D65_By * y + D65_Bz * z
+    m = min(r, g, b)
+    if m < 0:
+        r -= m
+        g -= m
+        b -= m
+
+    return gamma_contract_LUT(r), gamma_contract_LUT(g), gamma_contract_LUT(b)
+
+
+@nb.njit(cache=True, fastmath=True)
+def RGB_to_Lab_D50(r: float, g: float, b: float) -> Tuple[float]:
+    b = gamma_expand(b)
+    g = gamma_expand(g)
+    r = gamma_expand(r)
+    x = LABF((D50_Xr * r + D50_Xg * g + D50_Xb * b) / D50_Xw)
+    y = LABF(D50_Yr * r + D50_Yg * g + D50_Yb * b)
+    z = LABF((D50_Zr * r + D50_Zg * g + D50_Zb * b) / D50_Zw)
+    return 116 * y - 16, 500 * (x - y), 200 * (y - z)
+
+
+@nb.njit(cache=True, fastmath=True)
+def lightness_D50_LUT(r: float, g: float, b: float) -> float:
+    r = gamma_expand_LUT(r)
+    g = gamma_expand_LUT(g)
+    b = gamma_expand_LUT(b)
+    return 116 * LABF_LUT(D50_Yr * r + D50_Yg * g + D50_Yb * b) - 16
+
+
+@nb.njit(cache=True, fastmath=True)
+def Lab_D50_to_RGB_LUT(l: float, m: float, n: float) -> Tuple[float]:
+    l = (l + 16) / 116
+    x = D50_Xw * LABINVF_LUT(l + m / 500)
+    y = LABINVF_LUT(l)
+    z = D50_Zw * LABINVF_LUT(l - n / 200)
+    r = D50_Rx * x + D50_Ry * y + D50_Rz * z
+    g = D50_Gx * x + D50_Gy * y + D50_Gz * z
+    b = D50_Bx * x + D50_By * y + D50_Bz * z
+    m = min(r, g, b)
+    if m < 0:
+        r -= m
+        g -= m
+        b -= m
+
+    return gamma_contract_LUT(r), gamma_contract_LUT(g), gamma_contract_LUT(b)
+
+
 @nb.njit(cache=True, parallel=True)
 def loop_LCh(img: np.ndarray, mode: Callable) -> np.ndarray:
     height, width = img.shape[:2]
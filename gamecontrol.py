@@ -4,30 +4,11 @@ from itertools import cycle
 from logic import *
 from PyQt6.QtCore import QThread, pyqtSignal
 from PyQt6.QtTest import QTest
+from records import RECORDER
 from shared import GLOBALS, PLAYER_NAMES
 
 
 STATSPATH = Path(f"{FOLDER}/Data/stats.json")
-AIPLAYERS = {
-    "Novice AI": {"function": Menace.get_move, "extra_args": {"P1": (), "P2": ()}},
-    "Adept AI": {"function": fill_move, "extra_args": {"P1": (), "P2": ()}},
-    "Master AI": {
-        "function": stochastic_move,
-        "extra_args": {"P1": (STATES_P1, 1), "P2": (STATES_P2, 1)},
-    },
-    "Master AI+": {
-        "function": stochastic_move,
-        "extra_args": {"P1": (STATES_P1, 0), "P2": (STATES_P2, 0)},
-    },
-    "Super AI": {
-        "function": optimal_move,
-        "extra_args": {"P1": (STATES_P1_COUNTER, 1), "P2": (STATES_P2_COUNTER, 1)},
-    },
-    "Super AI+": {
-        "function": optimal_move,
-        "extra_args": {"P1": (STATES_P1_COUNTER, 0), "P2": (STATES_P2_COUNTER, 0)},
-    },
-}
 
 
 class Game(QThread):
@@ -75,7 +56,7 @@ class Game(QThread):
         self.change.emit()
 
     def nought(self) -> None:
-        self.make_move("state_string", "P1", "O")
+        self.make_move("state", "P1", "O")
 
     def cross(self) -> None:
         self.make_move("alternate_state", "P2", "X")
@@ -102,7 +83,7 @@ class Game(QThread):
 
     def counter_human(self) -> None:
         self.auto = False
-        self.make_move("state_string", self.match["AI"][0], "O")
+        self.make_move("state", self.match["AI"][0], "O")
         GLOBALS["live_active"] = "Human"
         self.playermove.emit()
         self.judge()
@@ -117,7 +98,7 @@ class Game(QThread):
         self.judge(True)
 
     def judge(self, move: bool = False) -> None:
-        state, winner, line = check_state(GLOBALS["GameBoard"].state_string)
+        state, winner, line = check_state(GLOBALS["GameBoard"].state)
         if winner:
             self.process_win(winner, line)
         elif state:
@@ -134,9 +115,8 @@ class Game(QThread):
         for v in self.players.values():
             self.stats[v[1]]["Tie"] += 1
 
-        if any(p[1] == "Novice AI" for p in self.players.values()):
-            Menace.back_propagate("Tie")
-
+        menace_result(None)
+        self.record_game(None)
         self.reset()
 
     def process_win(self, winner: str, line: range) -> None:
@@ -171,15 +151,13 @@ class Game(QThread):
 
         self.change.emit()
         self.gameover.emit()
-        self.post_process(win_name, loss_name)
+        self.post_process(win_name, win_number)
+        self.record_game(win_number)
         QTest.qWait(125)
         self.reset()
 
-    def post_process(self, win_name: str, loss_name: str) -> None:
-        if win_name == "Novice AI":
-            Menace.back_propagate("Win")
-        elif loss_name == "Novice AI":
-            Menace.back_propagate("Loss")
+    def post_process(self, win_name: str, win_number: str) -> None:
+        menace_result(win_number)
 
         if GLOBALS["popup"] and self.match:
             state = "Win" if win_name == "Human" else "Loss"
@@ -187,6 +165,16 @@ class Game(QThread):
             while self.messages[state].isVisible():
                 QTest.qWait(42)
 
+    def record_game(self, winner: str) -> None:
+        history = GLOBALS["GameBoard"].history
+        RECORDER.record(
+            self.players["P1"][1],
+            self.players["P2"][1],
+            (move for move, _ in history),
+            winner,
+            history[0][1] if history else "O",
+        )
+
     def auto_start(self) -> None:
         if (ai := self.match.get("AI")) and ai[0] == "P1" and not self.gamestarted:
             self.counter_human()
@@ -242,12 +230,11 @@ class Game(QThread):
         self.match = self.new_match.copy()
 
     def load_stats(self) -> None:
-        if STATSPATH.is_file():
-            self.stats = json.loads(STATSPATH.read_text())
-        else:
-            self.stats = {
-                k: {state: 0 for state in ("Win", "Loss", "Tie")} for k in PLAYER_NAMES
-            }
+        self.stats = json.loads(STATSPATH.read_text()) if STATSPATH.is_file() else {}
+        if missing := [k for k in PLAYER_NAMES if k not in self.stats]:
+            for k in missing:
+                self.stats[k] = {state: 0 for state in ("Win", "Loss", "Tie")}
+
             STATSPATH.write_text(json.dumps(self.stats, indent=4))
 
         GLOBALS["stats"] = self.stats
@@ -1,133 +1,680 @@
+import numpy as np
 import pickle
 import random
+import sys
 from bisect import bisect
-from collections import Counter, defaultdict
+from collections import OrderedDict
+from itertools import accumulate
 from pathlib import Path
-from typing import Tuple
+from threading import Lock
+from typing import Any, Iterable, Iterator, List, Tuple
 
 FOLDER = str(Path(__file__).parent).replace("\\", "/")
-MENACE_MEMORY = (
-    pickle.loads(file.read_bytes())
-    if (file := Path(f"{FOLDER}/Data/menace-memory.pkl")).is_file()
-    else defaultdict(Counter)
-)
 MOVESETS = ("high_stakes", "win_moves", "tie_moves")
-STATES_P1 = pickle.loads(Path(f"{FOLDER}/Data/tic-tac-toe-states-p1.pkl").read_bytes())
-STATES_P2 = pickle.loads(Path(f"{FOLDER}/Data/tic-tac-toe-states-p2.pkl").read_bytes())
-STATES_P1_COUNTER = pickle.loads(
-    Path(f"{FOLDER}/Data/tic-tac-toe-states-p1-counter.pkl").read_bytes()
+
+
+class Geometry:
+    def __init__(self, rows: int, columns: int, k: int) -> None:
+        self.rows = rows
+        self.columns = columns
+        self.k = k
+        self.cells = rows * columns
+        self.full = (1 << self.cells) - 1
+        self.shifts = {"O": 0, "X": self.cells}
+        self.lines = tuple(self.generate_lines())
+        self.masks = tuple(sum(1 << i for i in line) for line in self.lines)
+        self.order = tuple(
+            sorted(
+                range(self.cells), key=lambda i: -sum(i in line for line in self.lines)
+            )
+        )
+
+    def generate_lines(self) -> Iterator[range]:
+        span = self.k - 1
+        for down, right in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            step = down * self.columns + right
+            for row in range(self.rows - down * span):
+                for column in range(self.columns):
+                    if 0 <= column + right * span < self.columns:
+                        start = row * self.columns + column
+                        yield range(start, start + step * span + 1, step)
+
+    def decode(self, board: int) -> str:
+        return "".join(
+            "O" if board >> i & 1 else ("X" if board >> (i + self.cells) & 1 else " ")
+            for i in range(self.cells)
+        )
+
+    def swap(self, board: int) -> int:
+        return board >> self.cells | (board & self.full) << self.cells
+
+    def occupied(self, board: int) -> int:
+        return (board | board >> self.cells) & self.full
+
+    def legal_moves(self, board: int) -> Tuple[int]:
+        taken = self.occupied(board)
+        return tuple(i for i in range(self.cells) if not taken >> i & 1)
+
+    def check_state(self, board: int) -> Tuple[bool, str, range]:
+        for mask, line in zip(self.masks, self.lines):
+            for piece, shift in self.shifts.items():
+                if board >> shift & mask == mask:
+                    return True, piece, line
+
+        return self.occupied(board) == self.full, None, None
+
+    def gaps(self, board: int, piece: str) -> Tuple[int]:
+        own = board >> self.shifts[piece] & self.full
+        free = ~self.occupied(board)
+        return tuple(
+            dict.fromkeys(
+                gap.bit_length() - 1
+                for mask in self.masks
+                if (own & mask).bit_count() == self.k - 1 and (gap := mask & free)
+            )
+        )
+
+
+GEOMETRY = Geometry(3, 3, 3)
+LINES = tuple((line.start, line.stop, line.step) for line in GEOMETRY.lines)
+FULL = GEOMETRY.full
+PIECE_SHIFTS = GEOMETRY.shifts
+WIN_LINES = tuple(zip(GEOMETRY.masks, GEOMETRY.lines))
+LEGAL_MOVES = tuple(
+    tuple(i for i in range(9) if not mask >> i & 1) for mask in range(FULL + 1)
+)
+TERNARY = tuple(
+    sum(3**i for i in range(9) if mask >> i & 1) for mask in range(FULL + 1)
 )
-STATES_P2_COUNTER = pickle.loads(
-    Path(f"{FOLDER}/Data/tic-tac-toe-states-p2-counter.pkl").read_bytes()
+OUTCOMES_VERSION = 1
+OUTCOMES_PATH = Path(f"{FOLDER}/Data/tic-tac-toe-outcomes-v{OUTCOMES_VERSION}.npy")
+GAPS_VERSION = 1
+GAPS_PATH = Path(f"{FOLDER}/Data/tic-tac-toe-gaps-v{GAPS_VERSION}.npy")
+
+
+IDENTITY = tuple(range(9))
+ROTATION = tuple(3 * (2 - i % 3) + i // 3 for i in range(9))
+REFLECTION = tuple(3 * (i // 3) + 2 - i % 3 for i in range(9))
+
+
+def compose(first: Tuple[int], second: Tuple[int]) -> Tuple[int]:
+    return tuple(first[i] for i in second)
+
+
+SYMMETRIES = tuple(accumulate((ROTATION,) * 3, compose, initial=IDENTITY)) + tuple(
+    accumulate((ROTATION,) * 3, compose, initial=REFLECTION)
 )
 
-LINES = (
-    (0, 3, 1),
-    (3, 6, 1),
-    (6, 9, 1),
-    (0, 7, 3),
-    (1, 8, 3),
-    (2, 9, 3),
-    (0, 9, 4),
-    (2, 7, 2),
+
+def encode(board: str) -> int:
+    state = 0
+    for i, piece in enumerate(board):
+        if piece != " ":
+            state |= 1 << (i + PIECE_SHIFTS[piece])
+
+    return state
+
+
+def decode(board: int) -> str:
+    return "".join(
+        "O" if board >> i & 1 else ("X" if board >> (i + 9) & 1 else " ")
+        for i in range(9)
+    )
+
+
+def ternary(board: int) -> int:
+    return TERNARY[board & FULL] + 2 * TERNARY[board >> 9]
+
+
+def swap(board: int) -> int:
+    return board >> 9 | (board & FULL) << 9
+
+
+def occupied(board: int) -> int:
+    return (board | board >> 9) & FULL
+
+
+MENACE_PICKLE_PATH = Path(f"{FOLDER}/Data/menace-memory.pkl")
+MENACE_VERSION = 1
+MENACE_PATH = Path(f"{FOLDER}/Data/menace-memory-v{MENACE_VERSION}.npy")
+STATES_VERSION = 2
+CANONICAL_VERSION = 3
+STATE_FIELDS = np.dtype(
+    [
+        ("wins", np.int32),
+        ("ties", np.int32),
+        ("weights", np.int32, (3, 9)),
+        ("cumulative", np.int32, (3, 9)),
+        ("best", np.int8, 3),
+        ("decision", np.int8, 2),
+    ]
 )
 
 
-def check_state(board: str) -> Tuple[bool, str, range]:
-    for start, stop, step in LINES:
-        line = board[start:stop:step]
-        if len(set(line)) == 1 and (winner := line[0]) in {"O", "X"}:
-            return True, winner, range(start, stop, step)
+def argument(name: str, default: str) -> str:
+    return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+
+def states_path(side: str, canonical: bool) -> Path:
+    suffix = f"-d4-v{CANONICAL_VERSION}" if canonical else f"-v{STATES_VERSION}"
+    return Path(f"{FOLDER}/Data/tic-tac-toe-states-{side}{suffix}.npy")
+
+
+CANONICAL = states_path("p1", True).is_file()
+
+
+class State_Table:
+    def __init__(self, side: str) -> None:
+        self.path = states_path(side, CANONICAL)
+        self.fields = None
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        if self.fields is None:
+            table = np.load(self.path, mmap_mode="r")
+            self.fields = {name: table[name] for name in STATE_FIELDS.names}
+
+        return self.fields[field]
+
+
+class State_Registry:
+    levels = ("Master AI", "Master AI+", "Super AI", "Super AI+")
+
+    def __init__(self) -> None:
+        self.tables = {}
+
+    def __getitem__(self, key: Tuple[str, str]) -> State_Table:
+        level, side = key
+        if level not in self.levels:
+            raise KeyError(f"{level} does not use the state tables")
+
+        if side not in self.tables:
+            self.tables[side] = State_Table(side.lower())
+
+        return self.tables[side]
+
+
+STATES = State_Registry()
+STATES_P1 = STATES["Master AI", "P1"]
+STATES_P2 = STATES["Master AI", "P2"]
+STATES_P1_COUNTER = STATES["Super AI", "P1"]
+STATES_P2_COUNTER = STATES["Super AI", "P2"]
+
+
+def ternary_cells() -> np.ndarray:
+    return np.arange(3**9)[:, None] // 3 ** np.arange(9) % 3
+
+
+def outcome_table() -> np.ndarray:
+    cells = ternary_cells()
+    table = np.where(cells.all(axis=1), 1, 0).astype(np.uint8)
+    for index in range(len(WIN_LINES) - 1, -1, -1):
+        line = cells[:, WIN_LINES[index][1]]
+        for piece in (1, 2):
+            table[(line == piece).all(axis=1)] = 2 * index + piece + 1
+
+    return table
+
+
+OUTCOME_TABLE = np.load(OUTCOMES_PATH) if OUTCOMES_PATH.is_file() else outcome_table()
+OUTCOMES = ((False, None, None), (True, None, None)) + tuple(
+    (True, winner, line) for _, line in WIN_LINES for winner in ("O", "X")
+)
+
+
+def symmetry_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    images = ternary_cells()[:, SYMMETRIES]
+    codes = images @ 3 ** np.arange(9)
+    symmetries = codes.argmin(axis=1)
+    cells = images[np.arange(3**9), symmetries]
+    bits = 1 << np.arange(9)
+    boards = (cells == 1) @ bits | ((cells == 2) @ bits) << 9
+    return codes.min(axis=1), boards, symmetries
+
+
+def gap_table() -> np.ndarray:
+    cells = ternary_cells()
+    table = np.full((3**9, 3), -1, dtype=np.int8)
+    for column, piece in enumerate((1, 2)):
+        for _, line in reversed(WIN_LINES):
+            values = cells[:, line]
+            gaps = ((values == piece).sum(axis=1) == GEOMETRY.k - 1) & (
+                values == 0
+            ).any(axis=1)
+            table[gaps, column] = np.array(line)[values[gaps].argmin(axis=1)]
+
+    table[:, 2] = np.where(table[:, 0] >= 0, table[:, 0], table[:, 1])
+    return table
+
+
+def code_tables() -> Tuple[np.ndarray, np.ndarray]:
+    cells = ternary_cells()
+    bits = 1 << np.arange(9)
+    boards = (cells == 1) @ bits | ((cells == 2) @ bits) << 9
+    return boards, (3 - cells) % 3 @ 3 ** np.arange(9)
+
+
+CODE_TABLE, BOARD_TABLE, SYMMETRY_TABLE = symmetry_tables()
+CANONICAL_BOARDS = BOARD_TABLE.tolist()
+CANONICAL_SYMMETRIES = SYMMETRY_TABLE.tolist()
+CLASS_CODES, CLASS_TABLE = np.unique(CODE_TABLE, return_inverse=True)
+CANONICAL_CLASSES = CLASS_TABLE.tolist()
+PERMUTATIONS = np.array(SYMMETRIES)
+EMPTY_CELLS = ternary_cells() == 0
+FILL_TABLE = np.load(GAPS_PATH) if GAPS_PATH.is_file() else gap_table()
+GAP_TABLE = FILL_TABLE[:, 2]
+GAPS = {"O": FILL_TABLE[:, 0].tolist(), "X": FILL_TABLE[:, 1].tolist()}
+FORCED_MOVES = GAP_TABLE.tolist()
+BITBOARDS, SWAPPED_CODES = code_tables()
+
+
+def check_state(board: int) -> Tuple[bool, str, range]:
+    return OUTCOMES[OUTCOME_TABLE[ternary(board)]]
+
+
+def canonicalize(board: int) -> int:
+    return CANONICAL_BOARDS[ternary(board)]
+
 
-    return " " not in board, None, None
+def orient(code: int) -> Tuple[int, Tuple[int]]:
+    if CANONICAL:
+        return CANONICAL_CLASSES[code], SYMMETRIES[CANONICAL_SYMMETRIES[code]]
+
+    return code, IDENTITY
+
+
+def load_menace_pickle() -> dict:
+    memory = pickle.loads(MENACE_PICKLE_PATH.read_bytes())
+    return {
+        encode(board) if isinstance(board, str) else board: moves
+        for board, moves in memory.items()
+    }
+
+
+def menace_beads(memory: dict) -> np.ndarray:
+    beads = np.zeros((3**9, 9), dtype=np.int32)
+    for board, moves in memory.items():
+        for move, count in moves.items():
+            beads[ternary(board), move] = count
+
+    return beads
+
+
+def load_menace_memory(writable: bool = True) -> np.ndarray:
+    if MENACE_PATH.is_file():
+        return np.load(MENACE_PATH, mmap_mode="r+" if writable else "c")
+
+    beads = menace_beads(load_menace_pickle() if MENACE_PICKLE_PATH.is_file() else {})
+    if not writable:
+        return beads
+
+    memory = np.lib.format.open_memmap(
+        MENACE_PATH, mode="w+", dtype=beads.dtype, shape=beads.shape
+    )
+    memory[:] = beads
+    memory.flush()
+    return memory
+
+
+class Menace_Memory:
+    def __init__(
+        self,
+        writable: bool = True,
+        lock: Any = None,
+        shared: bool = False,
+        interval: int = 1,
+    ) -> None:
+        self.writable = writable
+        self.lock = lock or Lock()
+        self.shared = shared
+        self.interval = interval
+        self.updates = 0
+        self.beads = None
+        self.cumulative = {}
+
+    def load(self) -> np.ndarray:
+        if self.beads is None:
+            with self.lock:
+                if self.beads is None:
+                    self.beads = load_menace_memory(self.writable)
+
+        return self.beads
+
+    def reset(self, writable: bool, interval: int = 1) -> None:
+        with self.lock:
+            self.writable = writable
+            self.interval = interval
+            self.updates = 0
+            self.beads = None
+            self.cumulative.clear()
+
+    def save(self) -> None:
+        if isinstance(self.beads, np.memmap):
+            self.beads.flush()
+
+    def cumulative_weights(self, code: int, taken: int) -> List[int]:
+        if (weights := self.cumulative.get(code)) is None:
+            beads = self.load()
+            with self.lock:
+                weights = list(
+                    accumulate(
+                        0 if taken >> i & 1 else max(weight, 1)
+                        for i, weight in enumerate(beads[code].tolist())
+                    )
+                )
+                if not self.shared:
+                    self.cumulative[code] = weights
+
+        return weights
+
+    def update(self, episode: Iterable[Tuple[int, int]], delta: int) -> None:
+        beads = self.load()
+        with self.lock:
+            for code, move in episode:
+                weight = int(beads[code, move])
+                beads[code, move] = new = max(weight + delta, 1)
+                if weights := self.cumulative.get(code):
+                    change = new - max(weight, 1)
+                    self.cumulative[code] = weights[:move] + [
+                        total + change for total in weights[move:]
+                    ]
+
+            self.updates += 1
+            if self.interval and self.updates % self.interval == 0:
+                self.save()
 
 
 class Menace:
     deltas = {"Win": 5, "Tie": 1, "Loss": -1}
-    boards = []
-    moves = []
-
-    @staticmethod
-    def get_move(board: str) -> int:
-        Menace.boards.append(board)
-        choices = [i for i in range(9) if board[i] == " "]
-        states = MENACE_MEMORY[board]
-        move = random.choices(choices, weights=[states.get(c, 1) for c in choices])[0]
-        Menace.moves.append(move)
+
+    def __init__(self, memory: Menace_Memory) -> None:
+        self.memory = memory
+        self.boards = []
+        self.moves = []
+
+    def get_move(self, board: int) -> int:
+        code = ternary(board)
+        weights = self.memory.cumulative_weights(code, occupied(board))
+        move = bisect(weights, random.random() * weights[-1])
+        self.boards.append(code)
+        self.moves.append(move)
         return move
 
-    @staticmethod
-    def back_propagate(state: str) -> None:
-        delta = Menace.deltas[state]
-        for board, move in zip(Menace.boards, Menace.moves):
-            weight = MENACE_MEMORY[board][move]
-            MENACE_MEMORY[board][move] = max(weight + delta, 1)
+    def back_propagate(self, state: str) -> None:
+        if self.boards:
+            self.memory.update(zip(self.boards, self.moves), Menace.deltas[state])
+
+        self.boards.clear()
+        self.moves.clear()
+
+
+MENACE_MEMORY = Menace_Memory()
+MENACE = {"P1": Menace(MENACE_MEMORY), "P2": Menace(MENACE_MEMORY)}
+
+
+def menace_move(board: int, menace: Menace) -> int:
+    return menace.get_move(board)
+
+
+def menace_result(winner: str) -> None:
+    for side, menace in MENACE.items():
+        menace.back_propagate(
+            "Tie" if winner is None else ("Win" if side == winner else "Loss")
+        )
+
+
+class Negamax:
+    win = 1 << 20
+
+    def __init__(
+        self, geometry: Geometry, depth: int = None, capacity: int = 1 << 16
+    ) -> None:
+        self.geometry = geometry
+        self.depth = geometry.cells if depth is None else depth
+        self.capacity = capacity
+        self.table = OrderedDict()
+        self.nodes = 0
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def reset_counters(self) -> None:
+        self.nodes = self.probes = self.hits = 0
+
+    def lookup(self, board: int) -> tuple:
+        self.probes += 1
+        if entry := self.table.get(board):
+            self.hits += 1
+            self.table.move_to_end(board)
 
-        Menace.boards.clear()
-        Menace.moves.clear()
+        return entry
 
+    def store(self, board: int, entry: tuple) -> None:
+        self.table[board] = entry
+        self.table.move_to_end(board)
+        if len(self.table) > self.capacity:
+            self.table.popitem(last=False)
 
-def fill_line(board: str, piece: str) -> int:
-    for start, end, step in LINES:
-        line = board[start:end:step]
-        if line.count(piece) == 2 and " " in line:
-            return start + line.index(" ") * step
+    def evaluate(self, board: int) -> int:
+        own = board & self.geometry.full
+        other = board >> self.geometry.cells
+        score = 0
+        for mask in self.geometry.masks:
+            if not other & mask:
+                score += (own & mask).bit_count() ** 2
+            elif not own & mask:
+                score -= (other & mask).bit_count() ** 2
 
+        return score
 
-def fill_move(board: str) -> int:
-    for p in ("O", "X"):
-        if (pos := fill_line(board, p)) is not None:
-            return pos
+    def moves(self, board: int, best: int) -> List[int]:
+        if threats := self.geometry.gaps(board, "X"):
+            return list(threats)
 
-    return random.choice([i for i, p in enumerate(board) if p == " "])
+        taken = self.geometry.occupied(board)
+        moves = [move for move in self.geometry.order if not taken >> move & 1]
+        if best is not None:
+            moves.remove(best)
+            moves.insert(0, best)
 
+        return moves
 
-def stochastic_move(board: str, states: dict, low_stakes: bool = True) -> int:
-    for p in ("O", "X"):
-        if (pos := fill_line(board, p)) is not None:
-            return pos
+    def search(self, board: int, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        empty = self.geometry.cells - self.geometry.occupied(board).bit_count()
+        if self.geometry.gaps(board, "O"):
+            return self.win + empty - 1
 
-    state = states[board]
-    for moveset in MOVESETS[low_stakes:]:
-        if entry := state.get(moveset):
-            moves, weights = entry
-            return moves[bisect(weights, random.random() * weights[-1])]
+        if not empty:
+            return 0
 
-    return random.choice(state["legal_moves"])
+        if not depth:
+            return self.evaluate(board)
 
+        floor = alpha
+        best = None
+        if entry := self.lookup(board):
+            stored, value, bound, best = entry
+            if stored >= depth:
+                if not bound:
+                    return value
 
-def optimal_move(board: str, states: dict, low_stakes: bool = True) -> int:
-    for p in ("O", "X"):
-        if (pos := fill_line(board, p)) is not None:
-            return pos
+                if bound > 0:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
 
-    state = states[board]
-    for moveset in MOVESETS[low_stakes:]:
-        if entry := state.get(moveset):
-            return entry.most_common()[0][0]
+                if alpha >= beta:
+                    return value
 
-    return random.choice(state["legal_moves"])
+        value = -2 * self.win
+        for move in self.moves(board, best):
+            score = -self.search(
+                self.geometry.swap(board | 1 << move), depth - 1, -beta, -alpha
+            )
+            if score > value:
+                value, best = score, move
 
+            if (alpha := max(alpha, value)) >= beta:
+                break
 
-OTHER_PIECE = {"O": "X", "X": "O"}
+        bound = -1 if value <= floor else (1 if value >= beta else 0)
+        self.store(board, (depth, value, bound, best))
+        return value
+
+    def solve(self, board: int) -> Tuple[int, int]:
+        if gaps := self.geometry.gaps(board, "O"):
+            empty = self.geometry.cells - self.geometry.occupied(board).bit_count()
+            return self.win + empty - 1, gaps[0]
+
+        value = self.search(board, max(self.depth, 1), -2 * self.win, 2 * self.win)
+        return value, self.table[board][3]
+
+
+SOLVER = Negamax(GEOMETRY)
+
+
+def negamax_move(board: int, solver: Negamax) -> int:
+    return solver.solve(board)[1]
+
+
+def fill_line(board: int, piece: str) -> int:
+    return gap if (gap := GAPS[piece][ternary(board)]) >= 0 else None
+
+
+def fill_move(board: int) -> int:
+    if (gap := FORCED_MOVES[ternary(board)]) >= 0:
+        return gap
+
+    return random.choice(LEGAL_MOVES[occupied(board)])
+
+
+def stochastic_move(board: int, states: State_Table, low_stakes: bool = True) -> int:
+    if (gap := FORCED_MOVES[code := ternary(board)]) >= 0:
+        return gap
+
+    code, symmetry = orient(code)
+    for weights in states["cumulative"][code, low_stakes:]:
+        if total := weights[-1]:
+            return symmetry[bisect(weights, random.random() * total)]
+
+    return random.choice(LEGAL_MOVES[occupied(board)])
+
+
+def optimal_move(board: int, states: State_Table, low_stakes: bool = True) -> int:
+    code, symmetry = orient(ternary(board))
+    if (move := states["decision"][code, int(low_stakes)]) >= 0:
+        return symmetry[move]
+
+    return random.choice(LEGAL_MOVES[occupied(board)])
+
+
+def orient_codes(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if CANONICAL:
+        return CLASS_TABLE[codes], PERMUTATIONS[SYMMETRY_TABLE[codes]]
+
+    return codes, np.broadcast_to(PERMUTATIONS[0], (len(codes), 9))
+
+
+def random_moves(codes: np.ndarray, draws: np.ndarray) -> np.ndarray:
+    empty = EMPTY_CELLS[codes]
+    picks = (draws * empty.sum(axis=1)).astype(np.int64)
+    return (empty.cumsum(axis=1) > picks[:, None]).argmax(axis=1)
+
+
+def fill_moves(codes: np.ndarray, draws: np.ndarray) -> np.ndarray:
+    return np.where((gaps := GAP_TABLE[codes]) >= 0, gaps, random_moves(codes, draws))
+
+
+def stochastic_moves(
+    codes: np.ndarray, draws: np.ndarray, states: State_Table, low_stakes: bool = True
+) -> np.ndarray:
+    lookup, permutations = orient_codes(codes)
+    index = np.arange(len(codes))
+    cumulative = states["cumulative"][lookup, int(low_stakes) :]
+    totals = cumulative[..., -1]
+    weights = cumulative[index, (totals > 0).argmax(axis=1)]
+    picks = (weights <= (draws * weights[:, -1])[:, None]).sum(axis=1)
+    moves = np.where(
+        totals.any(axis=1),
+        permutations[index, np.minimum(picks, 8)],
+        random_moves(codes, draws),
+    )
+    return np.where((gaps := GAP_TABLE[codes]) >= 0, gaps, moves)
+
+
+def optimal_moves(
+    codes: np.ndarray,
+    states: State_Table,
+    low_stakes: bool = True,
+    draws: np.ndarray = None,
+) -> np.ndarray:
+    if draws is None:
+        draws = np.random.random(len(codes))
+
+    lookup, permutations = orient_codes(codes)
+    moves = states["decision"][lookup, int(low_stakes)]
+    return np.where(
+        moves >= 0,
+        permutations[np.arange(len(codes)), moves],
+        random_moves(codes, draws),
+    )
 
 
 class Game_Board:
-    def __init__(self) -> None:
-        self.choices = list(range(9))
-        self.state = [" "] * 9
+    def __init__(self, geometry: Geometry = GEOMETRY) -> None:
+        self.geometry = geometry
+        self.deltas = {
+            piece: tuple(
+                (1 << (i + shift), 1 << (i + geometry.cells - shift))
+                for i in range(geometry.cells)
+            )
+            for piece, shift in geometry.shifts.items()
+        }
+        self.history = []
+        self.reset()
 
     @property
     def state_string(self) -> str:
-        return "".join(self.state)
-
-    @property
-    def alternate_state(self) -> str:
-        return "".join(OTHER_PIECE.get(i, i) for i in self.state)
+        return self.geometry.decode(self.state)
 
     def submit(self, choice: int, player: str) -> None:
-        self.choices.remove(choice)
-        self.state[choice] = player
+        state, alternate_state = self.deltas[player][choice]
+        self.state |= state
+        self.alternate_state |= alternate_state
+        self.history.append((choice, player))
 
     def reset(self) -> None:
-        self.__init__()
+        self.state = self.alternate_state = 0
+        self.history.clear()
+
+
+AIPLAYERS = {
+    "Novice AI": {
+        "function": menace_move,
+        "extra_args": {"P1": (MENACE["P1"],), "P2": (MENACE["P2"],)},
+    },
+    "Adept AI": {"function": fill_move, "extra_args": {"P1": (), "P2": ()}},
+    "Master AI": {
+        "function": stochastic_move,
+        "extra_args": {"P1": (STATES_P1, 1), "P2": (STATES_P2, 1)},
+    },
+    "Master AI+": {
+        "function": stochastic_move,
+        "extra_args": {"P1": (STATES_P1, 0), "P2": (STATES_P2, 0)},
+    },
+    "Super AI": {
+        "function": optimal_move,
+        "extra_args": {"P1": (STATES_P1_COUNTER, 1), "P2": (STATES_P2_COUNTER, 1)},
+    },
+    "Super AI+": {
+        "function": optimal_move,
+        "extra_args": {"P1": (STATES_P1_COUNTER, 0), "P2": (STATES_P2_COUNTER, 0)},
+    },
+    "Negamax AI": {
+        "function": negamax_move,
+        "extra_args": {"P1": (SOLVER,), "P2": (SOLVER,)},
+    },
+}
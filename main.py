@@ -4,6 +4,7 @@ import sys
 from advanced import *
 from basics import *
 from gamecontrol import STATSPATH
+from records import RECORDER
 from preview import Preview
 from PyQt6.QtGui import QCloseEvent
 from PyQt6.QtTest import QTest
@@ -115,9 +116,10 @@ def exitgame() -> None:
     GLOBALS["run"] = False
     STATSPATH.write_text(json.dumps(GLOBALS["Game"].stats, indent=4))
     PLAYER_SETTINGS_PATH.write_text(json.dumps(PLAYER_SETTINGS, indent=4))
-    Path(f"{FOLDER}/Data/menace-memory.pkl").write_bytes(
-        pickle.dumps(MENACE_MEMORY, protocol=pickle.HIGHEST_PROTOCOL)
-    )
+    MENACE_MEMORY.save()
+    ICON_ATLAS.save()
+    RECORDER.flush()
+
     QTest.qWait(125)
     for window in QApplication.topLevelWidgets():
         window.close()
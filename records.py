@@ -0,0 +1,103 @@
+import numpy as np
+import time
+from logic import AIPLAYERS, FOLDER
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, Iterator
+
+
+RECORDS_VERSION = 2
+RECORDS_PATH = Path(f"{FOLDER}/Data/game-records-v{RECORDS_VERSION}.bin")
+RECORD_PLAYERS = ("Human",) + tuple(AIPLAYERS)
+RECORD_WINNERS = (None, "P1", "P2")
+RECORD_PIECES = ("O", "X")
+RECORD_FIELDS = np.dtype(
+    [
+        ("time", "<u4"),
+        ("moves", "<u8"),
+        ("p1", "u1"),
+        ("p2", "u1"),
+        ("winner", "u1"),
+        ("turns", "u1"),
+        ("first", "u1"),
+    ]
+)
+NO_MOVES = (1 << 64) - 1
+
+
+def pack_moves(moves: Iterable[int]) -> int:
+    packed = NO_MOVES
+    for i, move in enumerate(moves):
+        packed ^= (15 ^ move) << 4 * i
+
+    return packed
+
+
+def unpack_moves(packed: np.ndarray) -> np.ndarray:
+    moves = packed[:, None] >> np.arange(0, 36, 4, dtype=np.uint64) & np.uint64(15)
+    return np.where(moves == 15, -1, moves).astype(np.int8)
+
+
+class Game_Recorder:
+    def __init__(self, path: Path = RECORDS_PATH, capacity: int = 4096) -> None:
+        self.path = path
+        self.buffer = np.zeros(capacity, dtype=RECORD_FIELDS)
+        self.count = 0
+        self.lock = Lock()
+
+    def record(
+        self,
+        p1: str,
+        p2: str,
+        moves: Iterable[int],
+        winner: str,
+        first: str = "O",
+    ) -> None:
+        moves = tuple(moves)
+        with self.lock:
+            self.buffer[self.count] = (
+                int(time.time()),
+                pack_moves(moves),
+                RECORD_PLAYERS.index(p1),
+                RECORD_PLAYERS.index(p2),
+                RECORD_WINNERS.index(winner),
+                len(moves),
+                RECORD_PIECES.index(first),
+            )
+            self.count += 1
+            if self.count == len(self.buffer):
+                self.write()
+
+    def write(self) -> None:
+        if self.count:
+            with self.path.open("ab") as file:
+                file.write(self.buffer[: self.count].tobytes())
+
+            self.count = 0
+
+    def flush(self) -> None:
+        with self.lock:
+            self.write()
+
+
+RECORDER = Game_Recorder()
+
+
+def read_records(path: Path = RECORDS_PATH) -> np.ndarray:
+    if not path.is_file() or path.stat().st_size < RECORD_FIELDS.itemsize:
+        return np.zeros(0, dtype=RECORD_FIELDS)
+
+    return np.memmap(
+        path,
+        dtype=RECORD_FIELDS,
+        mode="r",
+        shape=(path.stat().st_size // RECORD_FIELDS.itemsize,),
+    )
+
+
+def iterate_records(
+    path: Path = RECORDS_PATH, chunk: int = 1 << 20
+) -> Iterator[np.ndarray]:
+    records = read_records(path)
+    for start in range(0, len(records), chunk):
+        yield records[start : start + chunk]
@@ -76,6 +76,7 @@ PLAYER_NAMES = (
     "Master AI+",
     "Super AI",
     "Super AI+",
+    "Negamax AI",
 )
 
 PLAYERS = {
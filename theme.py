@@ -1,9 +1,12 @@
 import numpy as np
 from basic_data import *
+from collections import OrderedDict
+from hashlib import blake2b
 from itertools import chain
+from pathlib import Path
 from PIL import Image
 from PyQt6.QtGui import QIcon, QImage, QPixmap
-from typing import Callable, Tuple
+from typing import List, Tuple
 
 
 WINDOWS = (
@@ -176,22 +179,11 @@ class Style_Combiner:
 
 
 class Icon:
-    def __init__(self, path: str) -> None:
-        self.img = np.array(Image.open(path))
+    def __init__(self, img: np.ndarray) -> None:
+        self.img = img
         self.height, self.width = self.img.shape[:2]
-        self.base = (self.img / 255)[..., 0:3]
-        self.color = np.zeros_like(self.base)
         self.set_icon()
 
-    def set_color(self, color: Tuple[int]) -> None:
-        self.color[...] = [i / 255 for i in color]
-
-    def set_blend(self, blend: Callable) -> None:
-        self.blend = blend
-        self.img[..., 0:3] = (
-            (blend(self.base, self.color) * 255).round().astype(np.uint8)
-        )
-
     def set_icon(self) -> None:
         self.qimage = QImage(
             bytearray(self.img), self.width, self.height, QImage.Format.Format_RGBA8888
@@ -201,36 +193,201 @@ class Icon:
         self.qicon = QIcon(self.qpixmap)
 
 
+ICONS_VERSION = 2
+ICONS_PATH = f"{FOLDER}/Data/piece-icons-v{ICONS_VERSION}.npz"
+SHAPE_INDEX = {shape: i for i, shape in enumerate(SHAPES)}
+SHAPE_IMAGES = np.stack(
+    [np.array(Image.open(f"{FOLDER}/icons/{shape}.png")) for shape in SHAPES]
+)
+SHAPE_BASES = {
+    "float64": SHAPE_IMAGES[..., 0:3] / 255,
+    "float32": (SHAPE_IMAGES[..., 0:3] / 255).astype(np.float32),
+}
+
+
+def icon_key(shape: str, blend: str, color: Tuple[int], backend: str, lut: bool) -> int:
+    r, g, b = color
+    digest = blake2b(
+        f"{shape}|{blend}|{r},{g},{b}|{backend}|{int(lut)}".encode(), digest_size=8
+    )
+    return int.from_bytes(digest.digest(), "little")
+
+
+def render_batch(
+    images: np.ndarray,
+    colors: np.ndarray,
+    blend: str,
+    backend: str = "float64",
+    bases: np.ndarray = None,
+    lut: bool = False,
+) -> np.ndarray:
+    if backend == "fixed":
+        if blend in FIXED_BLEND_MODES:
+            kernel, *functions = FIXED_BLEND_MODES[blend]
+            return kernel(images, colors, *functions)
+
+        backend = "float32"
+
+    dtype = np.dtype(backend)
+    if bases is None:
+        bases = (images[..., 0:3] / 255).astype(dtype)
+
+    kernel, *functions = (LUT_BLEND_MODES if lut else BATCH_BLEND_MODES)[blend]
+    return kernel(bases, (colors / 255).astype(dtype), images[..., 3], *functions)
+
+
+def render_icons(
+    shapes: List[str],
+    blend: str,
+    colors: List[Tuple[int]],
+    backend: str = "float64",
+    lut: bool = False,
+) -> np.ndarray:
+    indices = [SHAPE_INDEX[shape] for shape in shapes]
+    colors = np.array(colors, dtype=np.uint8).reshape(-1, 3)
+    return render_batch(
+        SHAPE_IMAGES[indices],
+        np.broadcast_to(colors, (len(indices), 3)),
+        blend,
+        backend,
+        SHAPE_BASES[backend][indices] if backend in SHAPE_BASES else None,
+        lut,
+    )
+
+
+def render_icon(
+    shape: str,
+    blend: str,
+    color: Tuple[int],
+    backend: str = "float64",
+    lut: bool = False,
+) -> np.ndarray:
+    return render_icons([shape], blend, [color], backend, lut)[0]
+
+
+class Icon_Atlas:
+    def __init__(
+        self,
+        path: str = ICONS_PATH,
+        capacity: int = 256,
+        pixmaps: int = 32,
+        backend: str = "fixed",
+        lut: bool = True,
+    ) -> None:
+        self.path = Path(path)
+        self.backend = backend
+        self.lut = lut
+        self.capacity = capacity
+        self.limit = pixmaps
+        self.pixmaps = OrderedDict()
+        self.load()
+
+    def load(self) -> None:
+        self.atlas = np.zeros((self.capacity, *SHAPE_IMAGES.shape[1:]), np.uint8)
+        self.keys = np.zeros(self.capacity, np.uint64)
+        if self.path.is_file():
+            with np.load(self.path) as data:
+                keys, atlas = data["keys"], data["atlas"]
+
+            if atlas.shape[1:] == self.atlas.shape[1:]:
+                count = min(len(keys), self.capacity)
+                self.keys[:count] = keys[:count]
+                self.atlas[:count] = atlas[:count]
+
+        self.slots = OrderedDict(
+            (int(self.keys[slot]), slot)
+            for slot in range(self.capacity - 1, -1, -1)
+            if self.keys[slot]
+        )
+        self.free = [
+            slot for slot in range(self.capacity - 1, -1, -1) if not self.keys[slot]
+        ]
+        self.changed = False
+
+    def allocate(self, key: int, img: np.ndarray) -> int:
+        slot = self.free.pop() if self.free else self.slots.popitem(last=False)[1]
+        self.atlas[slot] = img
+        self.keys[slot] = key
+        self.slots[key] = slot
+        self.changed = True
+        return slot
+
+    def slot(self, key: int, shape: str, blend: str, color: Tuple[int]) -> int:
+        if (slot := self.slots.get(key)) is not None:
+            self.slots.move_to_end(key)
+            return slot
+
+        return self.allocate(
+            key, render_icon(shape, blend, color, self.backend, self.lut)
+        )
+
+    def key(self, shape: str, blend: str, color: Tuple[int]) -> int:
+        return icon_key(shape, blend, color, self.backend, self.lut)
+
+    def icon(self, shape: str, blend: str, color: Tuple[int]) -> Icon:
+        key = self.key(shape, blend, color)
+        if (icon := self.pixmaps.get(key)) is not None:
+            self.pixmaps.move_to_end(key)
+            if key in self.slots:
+                self.slots.move_to_end(key)
+
+            return icon
+
+        icon = Icon(self.atlas[self.slot(key, shape, blend, color)].copy())
+        self.pixmaps[key] = icon
+        if len(self.pixmaps) > self.limit:
+            self.pixmaps.popitem(last=False)
+
+        return icon
+
+    def preload(self, blend: str, color: Tuple[int]) -> None:
+        keys = {shape: self.key(shape, blend, color) for shape in SHAPES}
+        missing = [shape for shape, key in keys.items() if key not in self.slots]
+        if missing:
+            images = render_icons(missing, blend, [color], self.backend, self.lut)
+            for shape, img in zip(missing, images):
+                self.allocate(keys[shape], img)
+
+    def save(self) -> None:
+        if self.changed:
+            slots = list(self.slots.values())[::-1]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(self.path, keys=self.keys[slots], atlas=self.atlas[slots])
+            self.changed = False
+
+
+ICON_ATLAS = Icon_Atlas()
+
+
 class Piece:
-    def __init__(self, color: Tuple[int], blend: str, choice: str, player: str) -> None:
+    def __init__(
+        self,
+        color: Tuple[int],
+        blend: str,
+        choice: str,
+        player: str,
+        atlas: Icon_Atlas = ICON_ATLAS,
+    ) -> None:
         GLOBALS[player] = self
-        self.choices = {shape: Icon(f"{FOLDER}/icons/{shape}.png") for shape in SHAPES}
+        self.atlas = atlas
         self.color = color
-        self.blend = BLEND_MODES[blend]
+        self.blend = blend
+        self.atlas.preload(blend, tuple(color))
         self.set_active(choice)
-        self.set_icon()
-
-    def __set_blend(self) -> None:
-        self.active.set_blend(self.blend)
 
     def set_active(self, choice: str) -> None:
-        self.active = self.choices[choice]
-        self.set_color()
-        self.__set_blend()
+        self.choice = choice
         self.set_icon()
 
     def set_color(self) -> None:
-        self.active.set_color(self.color)
-        self.__set_blend()
         self.set_icon()
 
     def set_blend(self, blend: str) -> None:
-        self.blend = BLEND_MODES[blend]
-        self.__set_blend()
+        self.blend = blend
         self.set_icon()
 
     def set_icon(self) -> None:
-        self.active.set_icon()
+        self.active = self.atlas.icon(self.choice, self.blend, tuple(self.color))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+import json
+import numpy as np
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from logic import (
+    AIPLAYERS,
+    MENACE_MEMORY,
+    SOLVER,
+    Game_Board,
+    argument,
+    check_state,
+    menace_result,
+)
+from records import Game_Recorder
+from typing import Iterable, Tuple
+
+
+RESULTS = ("Win", "Loss", "Tie")
+TURNS = (("P1", "O", "state"), ("P2", "X", "alternate_state"))
+
+
+def empty_stats(names: Iterable[str]) -> dict:
+    return {name: dict.fromkeys(RESULTS, 0) for name in names}
+
+
+def merge_stats(total: dict, stats: dict) -> dict:
+    for name, results in stats.items():
+        counts = total.setdefault(name, dict.fromkeys(RESULTS, 0))
+        for result, count in results.items():
+            counts[result] += count
+
+    return total
+
+
+def play_game(players: Tuple[str, str], board: Game_Board) -> str:
+    board.reset()
+    for turn in range(9):
+        player, piece, state = TURNS[turn % 2]
+        info = AIPLAYERS[players[turn % 2]]
+        board.submit(
+            info["function"](getattr(board, state), *info["extra_args"][player]),
+            piece,
+        )
+        over, winner, _ = check_state(board.state)
+        if over:
+            return winner
+
+
+def record_game(stats: dict, players: Tuple[str, str], winner: str) -> None:
+    if winner is None:
+        for name in players:
+            stats[name]["Tie"] += 1
+
+        menace_result(None)
+        return
+
+    index = "OX".index(winner)
+    win_name, loss_name = players[index], players[1 - index]
+    stats[win_name]["Win"] += 1
+    stats[loss_name]["Loss"] += 1
+    menace_result(TURNS[index][0])
+
+
+def run_games(p1: str, p2: str, games: int = 1, recorder: Game_Recorder = None) -> dict:
+    players = (p1, p2)
+    stats = empty_stats(players)
+    board = Game_Board()
+    for _ in range(games):
+        record_game(stats, players, winner := play_game(players, board))
+        if recorder:
+            recorder.record(
+                p1,
+                p2,
+                (move for move, _ in board.history),
+                winner and TURNS["OX".index(winner)][0],
+            )
+
+    return stats
+
+
+def play_shard(task: Tuple[str, str, int, int, bool]) -> Tuple[str, dict]:
+    p1, p2, games, seed, record = task
+    random.seed(seed)
+    MENACE_MEMORY.reset(False)
+    SOLVER.table.clear()
+    recorder = Game_Recorder() if record else None
+    stats = run_games(p1, p2, games, recorder)
+    if recorder:
+        recorder.flush()
+
+    return f"{p1} vs {p2}", stats
+
+
+def shard_tasks(games: int, seed: int, shards: int, record: bool = False) -> list:
+    pairings = [(p1, p2) for p1 in AIPLAYERS for p2 in AIPLAYERS]
+    sizes = [len(chunk) for chunk in np.array_split(np.arange(games), shards)]
+    seeds = np.random.SeedSequence(seed).generate_state(len(pairings) * shards)
+    tasks = [(p1, p2, size) for p1, p2 in pairings for size in sizes if size]
+    return [task + (int(seed), record) for task, seed in zip(tasks, seeds)]
+
+
+def round_robin(
+    games: int,
+    seed: int = 0,
+    workers: int = None,
+    shards: int = 16,
+    record: bool = False,
+) -> Tuple[dict, dict]:
+    workers = workers or os.cpu_count()
+    stats = empty_stats(AIPLAYERS)
+    matrix = {}
+    with ProcessPoolExecutor(workers) as executor:
+        for pairing, result in executor.map(
+            play_shard, shard_tasks(games, seed, shards, record)
+        ):
+            merge_stats(matrix.setdefault(pairing, {}), result)
+            merge_stats(stats, result)
+
+    return stats, matrix
+
+
+if __name__ == "__main__":
+    if "--round-robin" in sys.argv:
+        stats, matrix = round_robin(
+            int(argument("--round-robin", "1")),
+            int(argument("--seed", "0")),
+            int(argument("--workers", str(os.cpu_count()))),
+            record="--record" in sys.argv,
+        )
+        print(json.dumps({"stats": stats, "pairings": matrix}, indent=4))
+    else:
+        MENACE_MEMORY.reset("--save" in sys.argv, int(argument("--flush", "0")))
+        names = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+        recorder = Game_Recorder() if "--record" in sys.argv else None
+        stats = run_games(
+            names[0], names[1], int(names[2]) if len(names) > 2 else 1, recorder
+        )
+        MENACE_MEMORY.save()
+        if recorder:
+            recorder.flush()
+
+        print(json.dumps(stats, indent=4))
@@ -0,0 +1,144 @@
+import json
+import numpy as np
+import sys
+from logic import (
+    AIPLAYERS,
+    BITBOARDS,
+    EMPTY_CELLS,
+    OUTCOME_TABLE,
+    SWAPPED_CODES,
+    MENACE_MEMORY,
+    Menace,
+    Menace_Memory,
+    argument,
+    fill_move,
+    fill_moves,
+    menace_move,
+    optimal_move,
+    optimal_moves,
+    stochastic_move,
+    stochastic_moves,
+)
+from tournament import merge_stats
+
+
+SIDES = ("P1", "P2")
+
+
+def menace_moves(beads: np.ndarray, codes: np.ndarray, draws: np.ndarray) -> np.ndarray:
+    cumulative = (np.maximum(beads[codes], 1) * EMPTY_CELLS[codes]).cumsum(axis=1)
+    return (cumulative > (draws * cumulative[:, -1])[:, None]).argmax(axis=1)
+
+
+def batch_moves(
+    name: str, side: str, codes: np.ndarray, draws: np.ndarray, beads: np.ndarray
+) -> np.ndarray:
+    function = AIPLAYERS[name]["function"]
+    args = AIPLAYERS[name]["extra_args"][side]
+    if function is menace_move:
+        return menace_moves(beads, codes, draws)
+
+    if function is fill_move:
+        return fill_moves(codes, draws)
+
+    if function is stochastic_move:
+        return stochastic_moves(codes, draws, *args)
+
+    if function is optimal_move:
+        return optimal_moves(codes, *args, draws=draws)
+
+    return np.array(
+        [function(board, *args) for board in BITBOARDS[codes].tolist()],
+        dtype=np.int64,
+    )
+
+
+def apply_deltas(
+    beads: np.ndarray, states: np.ndarray, moves: np.ndarray, deltas: np.ndarray
+) -> None:
+    keys = states * 9 + moves
+    order = np.argsort(keys, kind="stable")
+    keys, deltas = keys[order], deltas[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    sizes = np.diff(np.r_[starts, len(keys)])
+    totals = np.add.reduceat(deltas, starts)
+    prefix = deltas.cumsum()
+    prefix -= np.repeat(prefix[starts] - deltas[starts], sizes)
+    floors = np.maximum.reduceat(np.repeat(totals, sizes) - prefix, starts) + 1
+    cells = np.unravel_index(keys[starts], beads.shape)
+    beads[cells] = np.maximum(beads[cells] + totals, floors)
+
+
+def play_batch(
+    beads: np.ndarray,
+    opponent: str,
+    seat: str,
+    games: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    codes = np.zeros(games, dtype=np.int64)
+    outcomes = np.zeros(games, dtype=np.uint8)
+    history = np.full((games, 5, 2), -1, dtype=np.int64)
+    live = np.arange(games)
+    for turn in range(9):
+        side = SIDES[turn % 2]
+        view = codes[live] if turn % 2 == 0 else SWAPPED_CODES[codes[live]]
+        draws = rng.random(len(live))
+        if side == seat:
+            moves = menace_moves(beads, view, draws)
+            history[live, turn // 2] = np.stack((view, moves), axis=1)
+        else:
+            moves = batch_moves(opponent, side, view, draws, beads)
+
+        codes[live] += 3**moves * (1 + turn % 2)
+        ended = (results := OUTCOME_TABLE[codes[live]]) > 0
+        outcomes[live[ended]] = results[ended]
+        if not (live := live[~ended]).size:
+            break
+
+    piece = SIDES.index(seat) + 1
+    winners = np.where(outcomes > 1, (outcomes.astype(np.int64) - 2) % 2 + 1, 0)
+    scores = np.where(winners == piece, 0, np.where(winners, 2, 1))
+    deltas = np.array([Menace.deltas[k] for k in ("Win", "Tie", "Loss")])[scores]
+    played = history[..., 1] >= 0
+    states, moves = history[played].T
+    apply_deltas(
+        beads, states, moves, np.broadcast_to(deltas[:, None], played.shape)[played]
+    )
+    return np.bincount(scores, minlength=3)
+
+
+def train_menace(
+    opponent: str,
+    games: int,
+    seat: str = "P1",
+    batch: int = 4096,
+    seed: int = None,
+    memory: Menace_Memory = MENACE_MEMORY,
+) -> dict:
+    rng = np.random.default_rng(seed)
+    beads = memory.load()
+    totals = np.zeros(3, dtype=np.int64)
+    for start in range(0, games, batch):
+        with memory.lock:
+            totals += play_batch(beads, opponent, seat, min(batch, games - start), rng)
+            memory.cumulative.clear()
+
+    memory.save()
+    wins, ties, losses = totals.tolist()
+    return merge_stats(
+        {"Novice AI": {"Win": wins, "Loss": losses, "Tie": ties}},
+        {opponent: {"Win": losses, "Loss": wins, "Tie": ties}},
+    )
+
+
+if __name__ == "__main__":
+    MENACE_MEMORY.reset("--save" in sys.argv)
+    stats = train_menace(
+        sys.argv[1],
+        int(sys.argv[2]),
+        argument("--seat", "P1"),
+        int(argument("--batch", "4096")),
+        int(seed) if (seed := argument("--seed", None)) else None,
+    )
+    print(json.dumps(stats, indent=4))